@@ -2,8 +2,9 @@
 
 import asyncio
 import logging
+import time
 import warnings
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
 from aiohttp import ClientError, ClientTimeout
@@ -12,16 +13,30 @@ from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# How long a fetched compiler list is reused before asking the API again
+COMPILERS_CACHE_TTL = 300
+# How long the fetched language list is reused before asking the API again
+LANGUAGES_CACHE_TTL = 300
+
 
 class CompilerExplorerClient:
     """Client for interacting with Compiler Explorer API."""
 
-    def __init__(self, config: Config):
-        """Initialize the API client."""
+    def __init__(self, config: Config, on_compilers_refresh: Optional[Callable[[str], None]] = None):
+        """Initialize the API client.
+
+        on_compilers_refresh, if given, is called with the language each time a fresh extended
+        compiler list is fetched, so callers can drop anything they derived from the old one.
+        """
         self.config = config
+        self._on_compilers_refresh = on_compilers_refresh
         self.session: Optional[aiohttp.ClientSession] = None
         self.connector: Optional[aiohttp.TCPConnector] = None
         self._closed = False
+        # Format: {(language, include_extended_info): (timestamp, compilers)}
+        self._compilers_cache: Dict[Tuple[str, bool], Tuple[float, List[Dict[str, Any]]]] = {}
+        # Format: (timestamp, languages)
+        self._languages_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
 
     async def __aenter__(self) -> "CompilerExplorerClient":
         """Async context manager entry."""
@@ -35,7 +50,8 @@ class CompilerExplorerClient:
         """Get or create aiohttp session."""
         if self.session is None:
             timeout = ClientTimeout(total=self.config.api.timeout)
-            self.connector = aiohttp.TCPConnector(limit=10, limit_per_host=5)
+            # The session is shared across tool calls, so keep idle connections around for reuse
+            self.connector = aiohttp.TCPConnector(limit=64, limit_per_host=16, keepalive_timeout=60, ttl_dns_cache=300)
             self.session = aiohttp.ClientSession(
                 headers={
                     "User-Agent": self.config.api.user_agent,
@@ -86,11 +102,16 @@ class CompilerExplorerClient:
         libraries: List[Dict[str, str]] | None = None,
         tools: List[Dict[str, Any]] | None = None,
         produce_opt_info: bool = False,
+        files: List[Dict[str, str]] | None = None,
     ) -> Dict[str, Any]:
-        """Compile source code."""
+        """Compile source code.
+
+        Assembly is only generated when get_assembly is set; callers that just need diagnostics skip it.
+        files are extra {"filename", "contents"} entries sent with the source in the same request.
+        """
         session = await self._get_session()
 
-        payload = {
+        payload: Dict[str, Any] = {
             "source": source,
             "compiler": compiler,
             "lang": language,
@@ -109,6 +130,7 @@ class CompilerExplorerClient:
                     "produceCppCheck": None,
                     "produceDevice": None,
                     "overrides": None,
+                    "skipAsm": not get_assembly,
                 },
                 "filters": {
                     "binary": (
@@ -168,6 +190,9 @@ class CompilerExplorerClient:
             },
         }
 
+        if files:
+            payload["files"] = files
+
         url = f"{self.config.api.endpoint}/compiler/{compiler}/compile"
 
         try:
@@ -489,18 +514,27 @@ class CompilerExplorerClient:
             raise
 
     async def get_languages(self) -> List[Dict[str, Any]]:
-        """Get list of supported languages."""
+        """Get list of supported languages.
+
+        Results are cached per client for LANGUAGES_CACHE_TTL seconds; failed fetches are not cached.
+        """
+        if self._languages_cache and (time.monotonic() - self._languages_cache[0]) < LANGUAGES_CACHE_TTL:
+            return self._languages_cache[1]
+
         session = await self._get_session()
         url = f"{self.config.api.endpoint}/languages"
 
         try:
             async with session.get(url) as response:
                 response.raise_for_status()
-                return await response.json()  # type: ignore[no-any-return]
+                languages: List[Dict[str, Any]] = await response.json()
         except ClientError as e:
             logger.error(f"Failed to get languages: {e}")
             raise
 
+        self._languages_cache = (time.monotonic(), languages)
+        return languages
+
     async def get_languages_list(self, search_text: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get simplified list of languages (id, name and extensions only) with optional search."""
         full_languages = await self.get_languages()
@@ -523,7 +557,15 @@ class CompilerExplorerClient:
         return simplified_languages
 
     async def get_compilers(self, language: str, include_extended_info: bool = False) -> List[Dict[str, Any]]:
-        """Get list of compilers for a language."""
+        """Get list of compilers for a language.
+
+        Results are cached per client for COMPILERS_CACHE_TTL seconds; failed fetches are not cached.
+        """
+        cache_key = (language, include_extended_info)
+        cached_entry = self._compilers_cache.get(cache_key)
+        if cached_entry and (time.monotonic() - cached_entry[0]) < COMPILERS_CACHE_TTL:
+            return cached_entry[1]
+
         session = await self._get_session()
 
         # Essential fields for compiler listing with library support info
@@ -565,11 +607,16 @@ class CompilerExplorerClient:
         try:
             async with session.get(url) as response:
                 response.raise_for_status()
-                return await response.json()  # type: ignore[no-any-return]
+                compilers: List[Dict[str, Any]] = await response.json()
         except ClientError as e:
             logger.error(f"Failed to get compilers: {e}")
             raise
 
+        self._compilers_cache[cache_key] = (time.monotonic(), compilers)
+        if include_extended_info and self._on_compilers_refresh is not None:
+            self._on_compilers_refresh(language)
+        return compilers
+
     async def get_libraries(self, language: str) -> List[Dict[str, Any]]:
         """Get list of libraries for a language."""
         session = await self._get_session()
@@ -2,7 +2,13 @@
 
 import difflib
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+Opcode = Tuple[str, int, int, int, int]
+
+# A plausible instruction mnemonic (lowercased first token of a line)
+_MNEMONIC = re.compile(r"^[a-z][a-z0-9._]*$")
 
 
 def extract_function_assembly(asm_text: str, function_name: str) -> Optional[str]:
@@ -35,51 +41,45 @@ def extract_function_assembly(asm_text: str, function_name: str) -> Optional[str
     return "\n".join(lines[start_idx:end_idx])
 
 
-def normalize_assembly(asm_text: str) -> List[str]:
-    """Normalize assembly for better comparison."""
-    lines = asm_text.splitlines()
-    normalized = []
-
-    for line in lines:
-        # Skip comment-only lines
-        if line.strip().startswith("#"):
-            continue
-
-        # Remove inline comments
-        if "#" in line:
-            line = line[: line.index("#")].rstrip()
+def normalize_assembly(asm_text: Union[str, Sequence[str]]) -> List[str]:
+    """Normalize assembly for better comparison.
 
-        # Skip empty lines
-        if not line.strip():
-            continue
-
-        # Normalize whitespace
-        line = " ".join(line.split())
-
-        normalized.append(line)
+    Accepts either the assembly text or its already-split lines.
+    """
+    lines = asm_text.splitlines() if isinstance(asm_text, str) else asm_text
 
-    return normalized
+    # Drop comments (whole-line or inline), collapse whitespace and skip lines left empty
+    return [normalized for line in lines if (normalized := " ".join(line.partition("#")[0].split()))]
 
 
 def generate_assembly_diff(
-    asm1: str,
-    asm2: str,
+    asm1: Union[str, Sequence[str]],
+    asm2: Union[str, Sequence[str]],
     label1: str = "Compiler 1",
     label2: str = "Compiler 2",
     context: int = 3,
 ) -> Dict[str, Any]:
-    """Generate a structured diff between two assembly outputs."""
+    """Generate a structured diff between two assembly outputs, given as text or pre-split lines."""
+    # Identical listings (e.g. a flag that doesn't affect codegen) need no diffing at all
+    if asm1 == asm2:
+        return _identical_diff()
+
     lines1 = normalize_assembly(asm1)
     lines2 = normalize_assembly(asm2)
+    if lines1 == lines2:
+        return _identical_diff()
+
+    # Match the listings once; the unified diff and side-by-side view both come from these opcodes
+    opcodes = match_lines(lines1, lines2)
 
     # Generate unified diff
-    diff_lines = list(difflib.unified_diff(lines1, lines2, fromfile=label1, tofile=label2, lineterm="", n=context))
+    diff_lines = format_unified_diff(lines1, lines2, opcodes, label1, label2, context)
 
     # Analyze the diff
     stats = analyze_diff(diff_lines)
 
     # Generate side-by-side comparison for key differences
-    side_by_side = generate_side_by_side(lines1, lines2, max_width=50)
+    side_by_side = generate_side_by_side(lines1, lines2, max_width=50, opcodes=opcodes)
 
     return {
         "unified_diff": "\n".join(diff_lines),
@@ -89,6 +89,84 @@ def generate_assembly_diff(
     }
 
 
+def _identical_diff() -> Dict[str, Any]:
+    """Return the diff result for two listings that normalize to the same lines."""
+    return {
+        "unified_diff": "",
+        "side_by_side": [],
+        "statistics": analyze_diff([]),
+        "summary": "Assembly is identical",
+    }
+
+
+def match_lines(lines1: Sequence[str], lines2: Sequence[str]) -> List[Opcode]:
+    """Compute diff opcodes, running SequenceMatcher only on the region between the common prefix and suffix.
+
+    With repeated lines the result can differ from SequenceMatcher over the full listings, including
+    the number of matched lines, so diffs and their statistics may not match the untrimmed output.
+    """
+    end1, end2 = len(lines1), len(lines2)
+    prefix = 0
+    while prefix < end1 and prefix < end2 and lines1[prefix] == lines2[prefix]:
+        prefix += 1
+    while end1 > prefix and end2 > prefix and lines1[end1 - 1] == lines2[end2 - 1]:
+        end1 -= 1
+        end2 -= 1
+
+    opcodes: List[Opcode] = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    if prefix < end1 or prefix < end2:
+        matcher = difflib.SequenceMatcher(None, lines1[prefix:end1], lines2[prefix:end2])
+        opcodes.extend(
+            (tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix) for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        )
+    if end1 < len(lines1):
+        opcodes.append(("equal", end1, len(lines1), end2, len(lines2)))
+    return opcodes
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a hunk range the way difflib.unified_diff does."""
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if not length:
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
+def format_unified_diff(
+    lines1: Sequence[str],
+    lines2: Sequence[str],
+    opcodes: Sequence[Opcode],
+    label1: str,
+    label2: str,
+    context: int = 3,
+) -> List[str]:
+    """Render precomputed opcodes as unified diff lines, matching difflib.unified_diff(lineterm="")."""
+    # get_opcodes() returns the matcher's opcodes once they are set, so grouping reuses ours without re-matching
+    matcher = difflib.SequenceMatcher()
+    matcher.opcodes = list(opcodes)  # type: ignore[attr-defined]
+
+    diff_lines: List[str] = []
+    for group in matcher.get_grouped_opcodes(context):
+        if not diff_lines:
+            diff_lines.append(f"--- {label1}")
+            diff_lines.append(f"+++ {label2}")
+        first, last = group[0], group[-1]
+        diff_lines.append(f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                diff_lines.extend(" " + line for line in lines1[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                diff_lines.extend("-" + line for line in lines1[i1:i2])
+            if tag in ("replace", "insert"):
+                diff_lines.extend("+" + line for line in lines2[j1:j2])
+    return diff_lines
+
+
 def analyze_diff(diff_lines: List[str]) -> Dict[str, Any]:
     """Analyze diff to extract statistics and patterns."""
     stats: Dict[str, Any] = {
@@ -143,6 +221,8 @@ def analyze_diff(diff_lines: List[str]) -> Dict[str, Any]:
     return stats
 
 
+# Pure per-line parser; diffs repeat the same lines (prologues, ret) many times
+@lru_cache(maxsize=65536)
 def extract_instruction(line: str) -> Optional[str]:
     """Extract the instruction mnemonic from an assembly line.
 
@@ -179,7 +259,7 @@ def extract_instruction(line: str) -> Optional[str]:
     # Basic heuristic: instructions are typically short alphanumeric strings
     # May contain dots (like ARM's conditional suffixes: beq.n)
     # May contain numbers (like x86's movq, arm's ldr.w)
-    if re.match(r"^[a-z][a-z0-9._]*$", potential_instruction):
+    if _MNEMONIC.match(potential_instruction):
         # Additional check: very long "instructions" are probably not instructions
         if len(potential_instruction) <= 10:  # reasonable length for most architectures
             return potential_instruction
@@ -187,6 +267,7 @@ def extract_instruction(line: str) -> Optional[str]:
     return None
 
 
+@lru_cache(maxsize=65536)
 def extract_function_call(line: str) -> Optional[str]:
     """Extract function call target from assembly line.
 
@@ -227,13 +308,16 @@ def extract_function_call(line: str) -> Optional[str]:
     return None
 
 
-def generate_side_by_side(lines1: List[str], lines2: List[str], max_width: int = 50) -> List[Tuple[str, str]]:
-    """Generate side-by-side comparison of key differences."""
+def generate_side_by_side(
+    lines1: List[str], lines2: List[str], max_width: int = 50, opcodes: Optional[Sequence[Opcode]] = None
+) -> List[Tuple[str, str]]:
+    """Generate side-by-side comparison of key differences, reusing ``opcodes`` when already computed."""
     # Use sequence matcher to find differences
-    matcher = difflib.SequenceMatcher(None, lines1, lines2)
+    if opcodes is None:
+        opcodes = match_lines(lines1, lines2)
     side_by_side = []
 
-    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+    for op, i1, i2, j1, j2 in opcodes:
         if op == "equal":
             # Skip equal parts in side-by-side view
             continue
@@ -1,12 +1,23 @@
 """CLI entry point for Compiler Explorer MCP."""
 
+import asyncio
 import logging
 from pathlib import Path
 
 import click
+from mcp.server import FastMCP
 
 from .config import Config
 from .server import create_server
+from .tools import close_shared_clients
+
+
+async def _serve(server: FastMCP) -> None:
+    """Serve over stdio, closing the shared API clients once the server has stopped."""
+    try:
+        await server.run_stdio_async()
+    finally:
+        await close_shared_clients()
 
 
 @click.command()
@@ -45,8 +56,8 @@ def main(config_path: Path, verbose: bool) -> None:
 
     logger.info("Starting Compiler Explorer MCP server...")
 
-    # Run the server
-    server.run()
+    # Run the server; the shared API clients live for the whole process, not for one client session
+    asyncio.run(_serve(server))
 
 
 if __name__ == "__main__":
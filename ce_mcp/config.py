@@ -4,7 +4,6 @@ import os
 from pathlib import Path
 from typing import Dict, Optional
 
-import yaml
 from pydantic import BaseModel, Field
 
 
@@ -94,8 +93,13 @@ class Config(BaseModel):
         if not path.exists():
             return cls()
 
+        # Imported lazily: PyYAML is only needed when a config file actually exists
+        import yaml
+
+        # Prefer the libyaml-backed loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(path, "r") as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=loader)
 
         if data and "compiler_explorer_mcp" in data:
             return cls(**data["compiler_explorer_mcp"])
@@ -1,5 +1,6 @@
 """Utility functions for finding and categorizing experimental compilers."""
 
+import asyncio
 import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
@@ -321,6 +322,10 @@ class ExperimentalCompilerFinder:
         return " | ".join(desc_parts)
 
 
+# The finder only holds precompiled patterns and keyword tables, so one instance is shared
+compiler_finder = ExperimentalCompilerFinder()
+
+
 def parse_version_info(raw_version_info: Dict[str, Any]) -> Dict[str, Any]:
     """
     Parse raw version info into a more structured format.
@@ -373,20 +378,33 @@ def parse_version_info(raw_version_info: Dict[str, Any]) -> Dict[str, Any]:
     return parsed
 
 
-async def fetch_version_info_for_compilers(compilers: List[ExperimentalCompiler], client: Any) -> None:
+async def fetch_version_info_for_compilers(
+    compilers: List[ExperimentalCompiler], client: Any, max_concurrency: int = 8
+) -> None:
     """
     Fetch version information for nightly compilers.
 
     Updates the version_info and modified fields for compilers where isNightly=True.
+    Requests are issued concurrently, with at most max_concurrency in flight, and each
+    compiler ID is fetched once even if it appears several times (e.g. in two categories).
     """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    nightlies_by_id: Dict[str, List[ExperimentalCompiler]] = {}
     for compiler in compilers:
         if compiler.is_nightly:
-            raw_version_info = await client.get_compiler_version(compiler.id)
-            if "error" not in raw_version_info:
-                parsed_info = parse_version_info(raw_version_info)
+            nightlies_by_id.setdefault(compiler.id, []).append(compiler)
+
+    async def fetch(compiler_id: str, targets: List[ExperimentalCompiler]) -> None:
+        async with semaphore:
+            raw_version_info = await client.get_compiler_version(compiler_id)
+        if "error" not in raw_version_info:
+            parsed_info = parse_version_info(raw_version_info)
+            for compiler in targets:
                 compiler.version_info = parsed_info
                 compiler.modified = parsed_info.get("modified", "")
 
+    await asyncio.gather(*(fetch(compiler_id, targets) for compiler_id, targets in nightlies_by_id.items()))
+
 
 async def search_experimental_compilers(
     language: str,
@@ -411,18 +429,17 @@ async def search_experimental_compilers(
         List of matching experimental compilers with version info
     """
     compilers = await client.get_compilers(language, include_extended_info=True)
-    finder = ExperimentalCompilerFinder()
 
     experimental_compilers: List[ExperimentalCompiler]
     if proposal:
-        experimental_compilers = finder.find_by_proposal(compilers, proposal)
+        experimental_compilers = compiler_finder.find_by_proposal(compilers, proposal)
     elif feature:
-        experimental_compilers = finder.find_by_feature(compilers, feature)
+        experimental_compilers = compiler_finder.find_by_feature(compilers, feature)
     elif category:
-        all_experimental = finder.get_all_experimental_compilers(compilers)
+        all_experimental = compiler_finder.get_all_experimental_compilers(compilers)
         experimental_compilers = [comp for comp in all_experimental if comp.category == category]
     else:
-        experimental_compilers = finder.get_all_experimental_compilers(compilers)
+        experimental_compilers = compiler_finder.get_all_experimental_compilers(compilers)
 
     # Fetch version info for nightly builds
     if fetch_versions:
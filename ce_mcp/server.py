@@ -28,6 +28,7 @@ logger = logging.getLogger(__name__)
 # Global config instance
 config = Config()
 
+
 # Create FastMCP server
 mcp = FastMCP("ce-mcp")
 
@@ -40,6 +41,7 @@ async def compile_check_tool(
     options: str = "",
     extract_args: bool = True,
     libraries: list | None = None,
+    files: list | None = None,
     create_binary: bool = False,
     create_object_only: bool = False,
 ) -> str:
@@ -63,6 +65,7 @@ async def compile_check_tool(
     - options: Compiler flags (e.g., "-O2 -Wall", "-std=c++20")
     - extract_args: If True, extracts compiler flags from source comments like "// flags: -Wall"
     - libraries: List of libraries with format [{"id": "library_name", "version": "latest"}]
+    - files: Additional files the source can #include, as [{"filename": "util.h", "contents": "..."}]
     - create_binary: If True, creates a full executable binary (enables binary analysis tools like ldd)
     - create_object_only: If True, creates object file without linking (for code without main function)
 
@@ -117,6 +120,7 @@ async def compile_check_tool(
             "options": options,
             "extract_args": extract_args,
             "libraries": libraries,
+            "files": files,
             "create_binary": create_binary,
             "create_object_only": create_object_only,
         },
@@ -250,6 +254,7 @@ async def compile_with_diagnostics_tool(
     options: str = "",
     diagnostic_level: str = "normal",
     libraries: list | None = None,
+    files: list | None = None,
     tools: list | None = None,
     create_binary: bool = False,
     create_object_only: bool = False,
@@ -277,6 +282,7 @@ async def compile_with_diagnostics_tool(
       - "normal": Standard warnings with -Wall
       - "verbose": Comprehensive warnings with -Wall -Wextra -Wpedantic
     - libraries: List of libraries with format [{"id": "library_name", "version": "latest"}]
+    - files: Additional files the source can #include, as [{"filename": "util.h", "contents": "..."}]
     - tools: List of tools to run alongside compilation (e.g., [{"id": "iwyu022", "args": []}])
     - create_binary: If True, creates a full executable binary (enables binary analysis tools like ldd)
     - create_object_only: If True, creates object file without linking (for code without main function)
@@ -349,6 +355,7 @@ async def compile_with_diagnostics_tool(
             "options": options,
             "diagnostic_level": diagnostic_level,
             "libraries": libraries,
+            "files": files,
             "tools": tools,
             "create_binary": create_binary,
             "create_object_only": create_object_only,
@@ -730,7 +737,8 @@ async def find_compilers_tool(
         },
         config,
     )
-    return json.dumps(result, indent=2)
+    # Listings can hold hundreds of compilers: skip indentation, which forces json's pure-Python encoder
+    return json.dumps(result)
 
 
 @mcp.tool()
@@ -1,18 +1,21 @@
 """Tool implementations for Compiler Explorer MCP."""
 
+import asyncio
 import difflib
+import hashlib
 import json
 import os
 import re
 import time
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from .api_client import CompilerExplorerClient
 from .assembly_diff import generate_assembly_diff
 from .config import Config
 from .experimental_utils import (
-    ExperimentalCompilerFinder,
+    compiler_finder,
     fetch_version_info_for_compilers,
     search_experimental_compilers,
 )
@@ -35,6 +38,53 @@ from .utils import (
 # Cache for compiler tools to avoid repeated API calls
 # Format: {f"{language}:{compiler_id}": {"tools": {...}, "timestamp": float}}
 _compiler_tools_cache: Dict[str, Dict[str, Any]] = {}
+_COMPILER_TOOLS_CACHE_MAX_ENTRIES = 512
+
+# Extended compiler list fetches in flight, shared by concurrent cache misses for the same language
+# Format: {(id(client), language): task}
+_compiler_tools_pending: Dict[Tuple[int, str], "asyncio.Task[List[Dict[str, Any]]]"] = {}
+
+
+# Clients shared across tool calls, so their connection pools outlive a single request. Keyed by every
+# Config setting the client reads, so equal Configs share a client and a client never sends another Config's settings
+# Format: {(endpoint, timeout, user_agent, filter values): client}
+_shared_clients: Dict[Tuple[Any, ...], CompilerExplorerClient] = {}
+
+# Cache for compare_compilers compile-only results (assembly and diagnostics)
+# Format: {blake2b digest of the inputs: (timestamp, (entry, assembly lines))}
+_compare_cache: Dict[bytes, Tuple[float, Tuple[Dict[str, Any], List[str]]]] = {}
+_COMPARE_CACHE_TTL = 3600  # 1 hour
+_COMPARE_CACHE_MAX_ENTRIES = 256
+
+
+def _client_key(config: Config) -> Tuple[Any, ...]:
+    """Return the Config settings a CompilerExplorerClient uses for its session and requests."""
+    return (config.api.endpoint, config.api.timeout, config.api.user_agent, *config.filters.model_dump().values())
+
+
+async def _get_client(config: Config) -> CompilerExplorerClient:
+    """Return the shared API client for config's settings, creating it on first use."""
+    key = _client_key(config)
+    client = _shared_clients.get(key)
+    if client is None:
+        client = _shared_clients[key] = CompilerExplorerClient(config, on_compilers_refresh=_forget_language_tools)
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close all shared API clients and drop the cached comparison results."""
+    clients = list(_shared_clients.values())
+    _shared_clients.clear()
+    _compare_cache.clear()
+    for client in clients:
+        await client.close()
+
+
+def _forget_language_tools(language: str) -> None:
+    """Drop the cached tools for a language once its compiler list has been fetched again."""
+    prefix = f"{language}:"
+    for cache_key in [key for key in _compiler_tools_cache if key.startswith(prefix)]:
+        del _compiler_tools_cache[cache_key]
 
 
 def clear_tools_cache() -> None:
@@ -43,6 +93,44 @@ def clear_tools_cache() -> None:
     _compiler_tools_cache.clear()
 
 
+async def _resolve_libraries(
+    libraries: Optional[List[Dict[str, str]]], language: str, compiler: str, client: CompilerExplorerClient
+) -> List[Dict[str, str]]:
+    """Validate and resolve requested libraries, adding suggestions to not-found errors."""
+    if not libraries:
+        return []
+    try:
+        return await validate_and_resolve_libraries(libraries, language, compiler, client)
+    except LibraryError as e:
+        # Try to provide helpful suggestions for library errors
+        if isinstance(e, LibraryNotFoundError):
+            # Extract the library name from the error for suggestions
+            error_msg = str(e)
+            if "'" in error_msg:
+                lib_name = error_msg.split("'")[1]
+                suggestions = await search_libraries(lib_name, language, client)
+                enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
+                raise LibraryError(enhanced_error)
+        raise
+
+
+async def _get_extended_compilers(client: CompilerExplorerClient, language: str) -> List[Dict[str, Any]]:
+    """Fetch the extended compiler list, sharing one request between concurrent callers."""
+    key = (id(client), language)
+    task = _compiler_tools_pending.get(key)
+    if task is None:
+        task = asyncio.ensure_future(client.get_compilers(language, include_extended_info=True))
+        _compiler_tools_pending[key] = task
+
+        def _done(finished: "asyncio.Task[List[Dict[str, Any]]]") -> None:
+            if _compiler_tools_pending.get(key) is finished:
+                del _compiler_tools_pending[key]
+
+        task.add_done_callback(_done)
+    # Shielded so one caller being cancelled does not cancel the fetch for the others
+    return await asyncio.shield(task)
+
+
 async def validate_tools_for_compiler(
     tools: List[Dict[str, Any]], compiler: str, language: str, client: "CompilerExplorerClient"
 ) -> Tuple[List[Dict[str, Any]], List[str]]:
@@ -66,14 +154,14 @@ async def validate_tools_for_compiler(
     # Check cache first
     cache_key = f"{language}:{compiler}"
     cache_ttl = 86400  # 1 day
-    current_time = time.time()
+    current_time = time.monotonic()
 
     cached_entry = _compiler_tools_cache.get(cache_key)
     if cached_entry and (current_time - cached_entry["timestamp"]) < cache_ttl:
         available_tools = cached_entry["tools"]
     else:
         # Get compiler info with tools data
-        compilers = await client.get_compilers(language, include_extended_info=True)
+        compilers = await _get_extended_compilers(client, language)
 
         # Find the specific compiler
         compiler_info = None
@@ -89,7 +177,10 @@ async def validate_tools_for_compiler(
 
         available_tools = compiler_info["tools"]
 
-        # Cache the result
+        # Cache the result, evicting the oldest entry once full; a re-stored key moves to the end
+        _compiler_tools_cache.pop(cache_key, None)
+        if len(_compiler_tools_cache) >= _COMPILER_TOOLS_CACHE_MAX_ENTRIES:
+            del _compiler_tools_cache[next(iter(_compiler_tools_cache))]
         _compiler_tools_cache[cache_key] = {"tools": available_tools, "timestamp": current_time}
     valid_tools = []
     warnings = []
@@ -142,6 +233,25 @@ async def validate_tools_for_compiler(
     return valid_tools, warnings
 
 
+# Compiler suggestion patterns as one alternation, each alternative capturing the suggested text
+_SUGGESTION = re.compile(
+    r"did you mean ['\"](?P<did_you_mean>[^'\"]+)['\"]"
+    r"|use ['\"](?P<use_instead>[^'\"]+)['\"] instead"
+    r"|suggested alternative: ['\"](?P<suggested>[^'\"]+)['\"]"
+    r"|fix-it applied: ['\"](?P<fixit>[^'\"]+)['\"]",  # fix-it hints (common in clang)
+    re.IGNORECASE,
+)
+
+# Output format for each kind of suggestion, in priority order when a message has several
+_SUGGESTION_FORMATS = {
+    "did_you_mean": "did you mean '{}'?",
+    "use_instead": "use '{}' instead",
+    "suggested": "suggested alternative: '{}'",
+    "fixit": "fix-it: '{}'",
+}
+_SUGGESTION_PRIORITY = {kind: priority for priority, kind in enumerate(_SUGGESTION_FORMATS)}
+
+
 def extract_compiler_suggestion(message: str) -> Optional[str]:
     """
     Extract compiler suggestions from diagnostic messages.
@@ -151,27 +261,86 @@ def extract_compiler_suggestion(message: str) -> Optional[str]:
     - "use 'xyz' instead"
     - "note: suggested alternative: 'xyz'"
     """
-    # Pattern for "did you mean" suggestions
-    did_you_mean = re.search(r"did you mean ['\"]([^'\"]+)['\"]", message, re.IGNORECASE)
-    if did_you_mean:
-        return f"did you mean '{did_you_mean.group(1)}'?"
+    # One scan over the message; if several kinds match, the highest-priority one wins
+    best = min(
+        _SUGGESTION.finditer(message),
+        key=lambda match: _SUGGESTION_PRIORITY[str(match.lastgroup)],
+        default=None,
+    )
+    if best is None:
+        return None
+    kind = str(best.lastgroup)
+    return _SUGGESTION_FORMATS[kind].format(best.group(kind))
+
+
+def _output_item_text(item: Any) -> str:
+    """Get the text of a stdout/stderr entry, which is either a {"text": ...} dict or a plain value."""
+    try:
+        return str(item["text"])
+    except KeyError:
+        return ""
+    except TypeError:
+        return str(item)
+
+
+def _join_output(output: Any) -> Any:
+    """Join a stdout/stderr payload given as a list of entries into one string; other values pass through."""
+    if isinstance(output, list):
+        try:
+            # Fast path: entries are almost always {"text": str} dicts
+            return "".join([item["text"] for item in output])
+        except (KeyError, TypeError):
+            return "".join(_iter_output_texts(output))
+    return output
+
+
+def _iter_output_texts(output: Any, prefix: str = "") -> Iterator[str]:
+    """Yield the text of each entry in a stdout/stderr payload (list of entries or a single value)."""
+    if isinstance(output, list):
+        for item in output:
+            yield prefix + _output_item_text(item)
+    else:
+        yield prefix + str(output)
+
 
-    # Pattern for "use X instead" suggestions
-    use_instead = re.search(r"use ['\"]([^'\"]+)['\"] instead", message, re.IGNORECASE)
-    if use_instead:
-        return f"use '{use_instead.group(1)}' instead"
+# Locations of stderr output in an API response as (container key, prefix), in reporting order:
+# buildResult (detailed compilation errors), the top-level response (high-level messages),
+# buildsteps (one container per step) and execResult (execution errors).
+_STDERR_SOURCES: Tuple[Tuple[str, str], ...] = (
+    ("buildResult", ""),
+    ("", ""),
+    ("buildsteps", "Build step {}: "),
+    ("execResult", "Execution: "),
+)
+
+
+def _iter_stderr_containers(result: Dict[str, Any], key: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (1-based index, container) pairs for a stderr source; an empty key is the response itself."""
+    container = result.get(key) if key else result
+    if isinstance(container, list):
+        yield from enumerate(container, 1)
+    else:
+        yield 1, container
 
-    # Pattern for "suggested alternative" notes
-    suggested = re.search(r"suggested alternative: ['\"]([^'\"]+)['\"]", message, re.IGNORECASE)
-    if suggested:
-        return f"suggested alternative: '{suggested.group(1)}'"
 
-    # Pattern for fix-it hints (common in clang)
-    fixit = re.search(r"fix-it applied: ['\"]([^'\"]+)['\"]", message, re.IGNORECASE)
-    if fixit:
-        return f"fix-it: '{fixit.group(1)}'"
+def _is_blank(text: str) -> bool:
+    """Whether text is empty or whitespace only, without allocating a stripped copy."""
+    return not text or text.isspace()
 
-    return None
+
+def _iter_all_stderr(result: Dict[str, Any]) -> Iterator[str]:
+    """Yield stderr texts from all known locations of an API response, in reporting order."""
+    has_details = False
+    for key, prefix in _STDERR_SOURCES:
+        for index, container in _iter_stderr_containers(result, key):
+            if not isinstance(container, dict) or not container.get("stderr"):
+                continue
+            for text in _iter_output_texts(container["stderr"], prefix.format(index)):
+                # Avoid duplicating generic "Build failed" if we have detailed errors
+                if text == "Build failed" and has_details:
+                    continue
+                has_details = has_details or not _is_blank(text)
+                yield text
 
 
 def _collect_all_stderr(result: Dict[str, Any]) -> str:
@@ -190,70 +359,9 @@ def _collect_all_stderr(result: Dict[str, Any]) -> str:
     Returns:
         Combined stderr string with all error messages
     """
-    stderr_parts = []
-
-    # 1. Get detailed compilation errors from buildResult.stderr
-    build_result = result.get("buildResult", {})
-    if "stderr" in build_result:
-        build_stderr = build_result["stderr"]
-        if isinstance(build_stderr, list):
-            for item in build_stderr:
-                if isinstance(item, dict):
-                    stderr_parts.append(item.get("text", ""))
-                else:
-                    stderr_parts.append(str(item))
-        else:
-            stderr_parts.append(str(build_stderr))
-
-    # 2. Get high-level messages from top-level result.stderr
-    if "stderr" in result:
-        top_stderr = result["stderr"]
-        if isinstance(top_stderr, list):
-            for item in top_stderr:
-                if isinstance(item, dict):
-                    text = item.get("text", "")
-                    # Avoid duplicating generic "Build failed" if we have detailed errors
-                    if text != "Build failed" or not stderr_parts:
-                        stderr_parts.append(text)
-                else:
-                    stderr_parts.append(str(item))
-        else:
-            stderr_parts.append(str(top_stderr))
-
-    # 3. Check for build step errors
-    if "buildsteps" in result and isinstance(result["buildsteps"], list):
-        for i, step in enumerate(result["buildsteps"]):
-            if isinstance(step, dict) and "stderr" in step:
-                step_stderr = step["stderr"]
-                if step_stderr:  # Only add non-empty stderr
-                    if isinstance(step_stderr, list):
-                        for item in step_stderr:
-                            if isinstance(item, dict):
-                                stderr_parts.append(f"Build step {i+1}: {item.get('text', '')}")
-                            else:
-                                stderr_parts.append(f"Build step {i+1}: {str(item)}")
-                    else:
-                        stderr_parts.append(f"Build step {i+1}: {str(step_stderr)}")
-
-    # 4. Check for execution errors
-    if "execResult" in result:
-        exec_result = result["execResult"]
-        if isinstance(exec_result, dict) and "stderr" in exec_result:
-            exec_stderr = exec_result["stderr"]
-            if exec_stderr:  # Only add non-empty stderr
-                if isinstance(exec_stderr, list):
-                    for item in exec_stderr:
-                        if isinstance(item, dict):
-                            stderr_parts.append(f"Execution: {item.get('text', '')}")
-                        else:
-                            stderr_parts.append(f"Execution: {str(item)}")
-                else:
-                    stderr_parts.append(f"Execution: {str(exec_stderr)}")
-
     # Join all stderr parts, filtering out empty ones
-    combined_stderr = "".join(part for part in stderr_parts if part.strip())
-
-    return combined_stderr
+    # str.join materialises its argument anyway, so hand it a list rather than a generator
+    return "".join([part for part in _iter_all_stderr(result) if not _is_blank(part)])
 
 
 async def compile_check(arguments: Dict[str, Any], config: Config) -> Dict[str, Any]:
@@ -264,6 +372,7 @@ async def compile_check(arguments: Dict[str, Any], config: Config) -> Dict[str,
     options = arguments.get("options", "")
     extract_args = arguments.get("extract_args", True)
     libraries = arguments.get("libraries")
+    files = arguments.get("files")
     create_binary = arguments.get("create_binary", False)
     create_object_only = arguments.get("create_object_only", False)
 
@@ -272,57 +381,74 @@ async def compile_check(arguments: Dict[str, Any], config: Config) -> Dict[str,
         if extracted_args:
             options = f"{options} {extracted_args}".strip()
 
-    client = CompilerExplorerClient(config)
-
-    try:
-        # Resolve libraries if provided
-        resolved_libraries = []
-        if libraries:
+    client = await _get_client(config)
 
-            try:
-                resolved_libraries = await validate_and_resolve_libraries(libraries, language, compiler, client)
-            except LibraryError as e:
-                # Try to provide helpful suggestions for library errors
-                if isinstance(e, LibraryNotFoundError):
-                    # Extract the library name from the error for suggestions
-                    error_msg = str(e)
-                    if "'" in error_msg:
-                        lib_name = error_msg.split("'")[1]
-                        suggestions = await search_libraries(lib_name, language, client)
-                        enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
-                        raise LibraryError(enhanced_error)
-                raise
-
-        # Build filter overrides for binary creation
-        filter_overrides = {}
-        if create_binary:
-            filter_overrides["binary"] = True
-        if create_object_only:
-            filter_overrides["binaryObject"] = True
-
-        result = await client.compile(
-            source,
-            language,
-            compiler,
-            options,
-            libraries=resolved_libraries,
-            filter_overrides=filter_overrides if filter_overrides else None,
-        )
-    finally:
-        await client.close()
+    # Resolve libraries if provided
+    resolved_libraries = await _resolve_libraries(libraries, language, compiler, client)
 
+    # Build filter overrides for binary creation
+    filter_overrides = {}
+    if create_binary:
+        filter_overrides["binary"] = True
+    if create_object_only:
+        filter_overrides["binaryObject"] = True
+
+    result = await client.compile(
+        source,
+        language,
+        compiler,
+        options,
+        libraries=resolved_libraries,
+        files=files,
+        filter_overrides=filter_overrides if filter_overrides else None,
+    )
+
+    # Count errors and warnings and find the first error in a single pass
+    error_count = 0
+    warning_count = 0
+    first_error = None
+    for diag in result.get("diagnostics", ()):
+        diag_type = diag.get("type")
+        if diag_type == "error":
+            error_count += 1
+            if first_error is None:
+                first_error = diag["message"]
+        elif diag_type == "warning":
+            warning_count += 1
+
+    exit_code = result.get("code", 1)
     return {
-        "success": result.get("code", 1) == 0,
-        "exit_code": result.get("code", 1),
-        "error_count": len([d for d in result.get("diagnostics", []) if d.get("type") == "error"]),
-        "warning_count": len([d for d in result.get("diagnostics", []) if d.get("type") == "warning"]),
-        "first_error": next(
-            (d["message"] for d in result.get("diagnostics", []) if d.get("type") == "error"),
-            None,
-        ),
+        "success": exit_code == 0,
+        "exit_code": exit_code,
+        "error_count": error_count,
+        "warning_count": warning_count,
+        "first_error": first_error,
     }
 
 
+def _execution_outcome(result: Dict[str, Any]) -> Tuple[bool, bool, int, Any, Any]:
+    """Normalise a compile-and-execute response into (compiled, executed, exit_code, stdout, stderr)."""
+    # Handle different API response formats
+    build_result = result.get("buildResult", result)
+    compiled = build_result.get("code", 1) == 0
+
+    # Check for execution results
+    executed = result.get("didExecute", False) or "execResult" in result
+
+    # Handle stdout/stderr from different locations
+    if compiled:
+        # For successful compilation, execution stdout/stderr is at top level
+        stdout = _join_output(result.get("stdout", ""))
+        stderr = _join_output(result.get("stderr", ""))
+    else:
+        # For failed compilation, get stdout from buildResult
+        stdout = _join_output(build_result.get("stdout", ""))
+        # Collect stderr from all possible locations
+        stderr = _collect_all_stderr(result)
+
+    return compiled, executed, result.get("code", -1), stdout, stderr
+
+
 async def compile_and_run(arguments: Dict[str, Any], config: Config) -> Dict[str, Any]:
     """Compile and run code, returning execution results."""
     source = arguments["source"]
@@ -337,88 +463,44 @@ async def compile_and_run(arguments: Dict[str, Any], config: Config) -> Dict[str
     create_binary = arguments.get("create_binary", False)
     create_object_only = arguments.get("create_object_only", False)
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
-    try:
-        # Resolve libraries if provided
-        resolved_libraries = []
-        if libraries:
+    # Resolve libraries if provided
+    resolved_libraries = await _resolve_libraries(libraries, language, compiler, client)
 
-            try:
-                resolved_libraries = await validate_and_resolve_libraries(libraries, language, compiler, client)
-            except LibraryError as e:
-                # Try to provide helpful suggestions for library errors
-                if isinstance(e, LibraryNotFoundError):
-                    # Extract the library name from the error for suggestions
-                    error_msg = str(e)
-                    if "'" in error_msg:
-                        lib_name = error_msg.split("'")[1]
-                        suggestions = await search_libraries(lib_name, language, client)
-                        enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
-                        raise LibraryError(enhanced_error)
-                raise
-
-        # Validate tools if provided
-        validated_tools = tools
-        tool_warnings: List[str] = []
-        if tools:
-            validated_tools, tool_warnings = await validate_tools_for_compiler(tools, compiler, language, client)
-
-        # Build filter overrides for binary creation
-        filter_overrides = {}
-        if create_binary:
-            filter_overrides["binary"] = True
-        if create_object_only:
-            filter_overrides["binaryObject"] = True
-
-        result = await client.compile_and_execute(
-            source,
-            language,
-            compiler,
-            options,
-            stdin,
-            args,
-            timeout,
-            resolved_libraries,
-            validated_tools,
-            filter_overrides=filter_overrides if filter_overrides else None,
-        )
-    finally:
-        await client.close()
+    # Validate tools if provided
+    validated_tools = tools
+    tool_warnings: List[str] = []
+    if tools:
+        validated_tools, tool_warnings = await validate_tools_for_compiler(tools, compiler, language, client)
 
-    # Handle different API response formats
-    build_result = result.get("buildResult", result)
-    compiled = build_result.get("code", 1) == 0
-
-    # Check for execution results
-    executed = result.get("didExecute", False) or "execResult" in result
-    exit_code = result.get("code", -1)
-    exec_time = result.get("execTime", 0)
-
-    # Handle stdout/stderr from different locations
-    if compiled:
-        # For successful compilation, execution stdout/stderr is at top level
-        stdout = result.get("stdout", "")
-        stderr = result.get("stderr", "")
-    else:
-        # For failed compilation, get stdout from buildResult
-        stdout = build_result.get("stdout", "")
-        # Collect stderr from all possible locations
-        stderr = _collect_all_stderr(result)
-
-    # Convert arrays to strings for both stdout and stderr
-    if isinstance(stdout, list):
-        stdout = "".join(item.get("text", "") if isinstance(item, dict) else str(item) for item in stdout)
-
-    # stderr is already processed by _collect_all_stderr for compilation failures
-    if compiled and isinstance(stderr, list):
-        stderr = "".join(item.get("text", "") if isinstance(item, dict) else str(item) for item in stderr)
+    # Build filter overrides for binary creation
+    filter_overrides = {}
+    if create_binary:
+        filter_overrides["binary"] = True
+    if create_object_only:
+        filter_overrides["binaryObject"] = True
+
+    result = await client.compile_and_execute(
+        source,
+        language,
+        compiler,
+        options,
+        stdin,
+        args,
+        timeout,
+        resolved_libraries,
+        validated_tools,
+        filter_overrides=filter_overrides if filter_overrides else None,
+    )
+
+    compiled, executed, exit_code, stdout, stderr = _execution_outcome(result)
 
     response = {
         "compiled": compiled,
         "executed": executed,
         "exit_code": exit_code,
-        "execution_time_ms": exec_time,
+        "execution_time_ms": result.get("execTime", 0),
         "stdout": stdout,
         "stderr": stderr,
         "truncated": result.get("truncated", False),
@@ -431,6 +513,45 @@ async def compile_and_run(arguments: Dict[str, Any], config: Config) -> Dict[str
     return response
 
 
+# Diagnostic types for tag severity levels below error (0=note, 1=warning, 2=error, 3=fatal)
+_SEVERITY_TYPES = {0: "note", 1: "warning"}
+
+# Classifies untagged diagnostics: the word "error" rather than any substring (e.g. "terror")
+_ERROR_WORD = re.compile(r"\berror\b", re.IGNORECASE)
+
+
+def _diagnostic_entry(diag: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Shape one stderr entry as a diagnostic, or return None if it carries no diagnostic information."""
+    # Skip context lines and code snippets that don't have tags
+    if "text" not in diag:
+        return None
+
+    tag = diag.get("tag")
+    if isinstance(tag, dict):
+        severity = tag.get("severity", 2)
+        diag_type = "error" if severity >= 2 else _SEVERITY_TYPES.get(severity, "warning")
+        line = tag.get("line", 0)
+        column = tag.get("column", 0)
+        # Use the clean text from tag if available, otherwise use raw text
+        message = tag.get("text", diag["text"])
+    elif "line" in diag and "column" in diag:
+        # Fallback for entries with line/column but no tag (older format)
+        diag_type = "error" if _ERROR_WORD.search(diag["text"]) else "warning"
+        line = diag["line"]
+        column = diag["column"]
+        message = diag["text"]
+    else:
+        return None
+
+    return {
+        "type": diag_type,
+        "line": line,
+        "column": column,
+        "message": message,
+        "suggestion": extract_compiler_suggestion(message),
+    }
+
+
 async def compile_with_diagnostics(arguments: Dict[str, Any], config: Config) -> Dict[str, Any]:
     """Get comprehensive compilation warnings and errors."""
     source = arguments["source"]
@@ -439,6 +560,7 @@ async def compile_with_diagnostics(arguments: Dict[str, Any], config: Config) ->
     options = arguments.get("options", "")
     diagnostic_level = arguments.get("diagnostic_level", "normal")
     libraries = arguments.get("libraries")
+    files = arguments.get("files")
     tools = arguments.get("tools")
     create_binary = arguments.get("create_binary", False)
     create_object_only = arguments.get("create_object_only", False)
@@ -448,110 +570,42 @@ async def compile_with_diagnostics(arguments: Dict[str, Any], config: Config) ->
     elif diagnostic_level == "normal":
         options = f"{options} -Wall".strip()
 
-    client = CompilerExplorerClient(config)
-
-    try:
-        # Resolve libraries if provided
-        resolved_libraries = []
-        if libraries:
-
-            try:
-                resolved_libraries = await validate_and_resolve_libraries(libraries, language, compiler, client)
-            except LibraryError as e:
-                # Try to provide helpful suggestions for library errors
-                if isinstance(e, LibraryNotFoundError):
-                    # Extract the library name from the error for suggestions
-                    error_msg = str(e)
-                    if "'" in error_msg:
-                        lib_name = error_msg.split("'")[1]
-                        suggestions = await search_libraries(lib_name, language, client)
-                        enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
-                        raise LibraryError(enhanced_error)
-                raise
-
-        # Validate tools if provided
-        validated_tools = tools
-        tool_warnings: List[str] = []
-        if tools:
-            validated_tools, tool_warnings = await validate_tools_for_compiler(tools, compiler, language, client)
-
-        # Build filter overrides for binary creation
-        filter_overrides = {}
-        if create_binary:
-            filter_overrides["binary"] = True
-        if create_object_only:
-            filter_overrides["binaryObject"] = True
-
-        result = await client.compile(
-            source,
-            language,
-            compiler,
-            options,
-            libraries=resolved_libraries,
-            tools=validated_tools,
-            filter_overrides=filter_overrides if filter_overrides else None,
-        )
-    finally:
-        await client.close()
-
-    diagnostics = []
-    for diag in result.get("stderr", []):
-        if "text" in diag:
-            # Only process entries with actual diagnostic information
-            # Skip context lines and code snippets that don't have tags
-            if "tag" in diag and isinstance(diag["tag"], dict):
-                tag = diag["tag"]
-                # Use severity levels: 0=note, 1=warning, 2=error, 3=fatal
-                severity = tag.get("severity", 2)
-                if severity == 0:
-                    diag_type = "note"
-                elif severity == 1:
-                    diag_type = "warning"
-                elif severity >= 2:
-                    diag_type = "error"
-                else:
-                    diag_type = "warning"  # fallback
-
-                # Extract line/column from tag
-                line = tag.get("line", 0)
-                column = tag.get("column", 0)
+    client = await _get_client(config)
 
-                # Use the clean text from tag if available, otherwise use raw text
-                message = tag.get("text", diag["text"])
+    # Resolve libraries if provided
+    resolved_libraries = await _resolve_libraries(libraries, language, compiler, client)
 
-                # Extract suggestions from message text
-                suggestion = extract_compiler_suggestion(message)
+    # Validate tools if provided
+    validated_tools = tools
+    tool_warnings: List[str] = []
+    if tools:
+        validated_tools, tool_warnings = await validate_tools_for_compiler(tools, compiler, language, client)
 
-                diagnostics.append(
-                    {
-                        "type": diag_type,
-                        "line": line,
-                        "column": column,
-                        "message": message,
-                        "suggestion": suggestion,
-                    }
-                )
-            elif "line" in diag and "column" in diag:
-                # Fallback for entries with line/column but no tag (older format)
-                diag_type = "error" if "error" in diag["text"].lower() else "warning"
-                line = diag.get("line", 0)
-                column = diag.get("column", 0)
-                message = diag["text"]
-                suggestion = extract_compiler_suggestion(message)
-
-                diagnostics.append(
-                    {
-                        "type": diag_type,
-                        "line": line,
-                        "column": column,
-                        "message": message,
-                        "suggestion": suggestion,
-                    }
-                )
+    # Build filter overrides for binary creation
+    filter_overrides = {}
+    if create_binary:
+        filter_overrides["binary"] = True
+    if create_object_only:
+        filter_overrides["binaryObject"] = True
+
+    result = await client.compile(
+        source,
+        language,
+        compiler,
+        options,
+        # Post-compilation tools such as llvm-mca read the generated assembly
+        get_assembly=bool(validated_tools),
+        libraries=resolved_libraries,
+        files=files,
+        tools=validated_tools,
+        filter_overrides=filter_overrides if filter_overrides else None,
+    )
+
+    diagnostics = [entry for diag in result.get("stderr", ()) if (entry := _diagnostic_entry(diag)) is not None]
 
     # Extract tool outputs if available
     tool_outputs = []
-    for tool_result in result.get("tools", []):
+    for tool_result in result.get("tools", ()):
         if isinstance(tool_result, dict) and "stdout" in tool_result:
             tool_outputs.append(
                 {
@@ -595,76 +649,54 @@ async def analyze_optimization(arguments: Dict[str, Any], config: Config) -> Dic
         filter_overrides["demangle"] = arguments["do_demangle"]
 
     options = optimization_level
-    client = CompilerExplorerClient(config)
-
-    try:
-        # Resolve libraries if provided
-        resolved_libraries = []
-        if libraries:
-
-            try:
-                resolved_libraries = await validate_and_resolve_libraries(libraries, language, compiler, client)
-            except LibraryError as e:
-                # Try to provide helpful suggestions for library errors
-                if isinstance(e, LibraryNotFoundError):
-                    # Extract the library name from the error for suggestions
-                    error_msg = str(e)
-                    if "'" in error_msg:
-                        lib_name = error_msg.split("'")[1]
-                        suggestions = await search_libraries(lib_name, language, client)
-                        enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
-                        raise LibraryError(enhanced_error)
-                raise
-
-        result = await client.compile(
-            source,
-            language,
-            compiler,
-            options,
-            get_assembly=True,
-            filter_overrides=filter_overrides if filter_overrides else None,
-            libraries=resolved_libraries,
-            produce_opt_info=True,
-        )
-    finally:
-        await client.close()
+    client = await _get_client(config)
+
+    # Resolve libraries if provided
+    resolved_libraries = await _resolve_libraries(libraries, language, compiler, client)
+
+    result = await client.compile(
+        source,
+        language,
+        compiler,
+        options,
+        get_assembly=True,
+        filter_overrides=filter_overrides if filter_overrides else None,
+        libraries=resolved_libraries,
+        produce_opt_info=True,
+    )
 
     asm_output = result.get("asm", "")
 
     # Handle assembly output which might be a list of objects or strings
     if isinstance(asm_output, list):
-        asm_text = "\n".join(item.get("text", "") if isinstance(item, dict) else str(item) for item in asm_output)
+        asm_text = "\n".join(map(_output_item_text, asm_output))
     else:
         asm_text = asm_output
 
     # Return all assembly lines that Compiler Explorer provides
     asm_lines = asm_text.splitlines() if asm_text else []
-    instruction_lines = []
 
+    # Collect non-empty lines, stopping once the readability limit is exceeded
+    max_asm_lines = config.output_limits.max_assembly_lines
+    instruction_lines: List[str] = []
+    truncated_asm = False
     for line in asm_lines:
         line = line.strip()
         # Only skip completely empty lines
-        if line:
-            instruction_lines.append(line)
-
-    # Limit assembly output for readability
-    max_asm_lines = config.output_limits.max_assembly_lines
-    truncated_asm = False
-    if len(instruction_lines) > max_asm_lines:
-        instruction_lines = instruction_lines[:max_asm_lines]
-        truncated_asm = True
+        if not line:
+            continue
+        if len(instruction_lines) == max_asm_lines:
+            truncated_asm = True
+            break
+        instruction_lines.append(line)
 
     # Extract optimization information if available
     opt_output = result.get("optOutput", [])
-    optimization_info = []
+    optimization_info: List[str] = []
     if opt_output:
         # Handle optimization output which might be a list of objects
         if isinstance(opt_output, list):
-            for item in opt_output:
-                if isinstance(item, dict):
-                    optimization_info.append(item.get("text", ""))
-                else:
-                    optimization_info.append(str(item))
+            optimization_info.extend(map(_output_item_text, opt_output))
         else:
             optimization_info.append(str(opt_output))
 
@@ -697,7 +729,7 @@ async def analyze_optimization(arguments: Dict[str, Any], config: Config) -> Dic
         "instruction_count": len(instruction_lines),
         "assembly_output": instruction_lines,
         "truncated": truncated_asm,
-        "total_instructions": len(instruction_lines) + (len(asm_lines) - max_asm_lines if truncated_asm else 0),
+        "total_instructions": len(asm_lines) if truncated_asm else len(instruction_lines),
     }
 
     # Include optimization info if available
@@ -711,6 +743,61 @@ async def analyze_optimization(arguments: Dict[str, Any], config: Config) -> Dic
     return return_data
 
 
+_WARNING_TEXT = re.compile("warning", re.IGNORECASE)
+
+
+def _count_warnings(stderr: Any) -> int:
+    """Count stderr entries whose text mentions a warning."""
+    return sum(1 for entry in stderr if _WARNING_TEXT.search(entry.get("text", "")))
+
+
+# Outputs larger than this (combined, in characters) are not diffed line by line:
+# difflib's matcher is pure Python and can take quadratic time on big, dissimilar inputs
+_MAX_EXECUTION_DIFF_CHARS = 1_000_000
+
+
+def _compare_output_stream(
+    stream: str,
+    result1: Dict[str, Any],
+    result2: Dict[str, Any],
+    differences: List[str],
+    diff_details: Dict[str, Any],
+) -> None:
+    """Record how one output stream ("stdout" or "stderr") differs between two execution results."""
+    text1, text2 = result1[stream], result2[stream]
+    if text1 == text2:
+        return
+
+    label = stream.capitalize()
+    lines1, lines2 = text1.splitlines(), text2.splitlines()
+    diff_lines = len(lines2) - len(lines1)
+    if diff_lines:
+        if diff_lines > 0:
+            differences.append(f"{label} differs: {result2['compiler']} output has {diff_lines} more lines")
+        else:
+            differences.append(f"{label} differs: {result1['compiler']} output has {abs(diff_lines)} more lines")
+    else:
+        differences.append(f"{label} content differs")
+
+    if len(text1) + len(text2) > _MAX_EXECUTION_DIFF_CHARS:
+        diff_details[f"{stream}_diff"] = (
+            f"(diff omitted: outputs total {len(text1) + len(text2)} characters, "
+            f"over the {_MAX_EXECUTION_DIFF_CHARS} character limit)"
+        )
+        return
+
+    # Generate unified diff
+    diff_details[f"{stream}_diff"] = "\n".join(
+        difflib.unified_diff(
+            lines1,
+            lines2,
+            fromfile=f"{result1['compiler']} {result1['options']}",
+            tofile=f"{result2['compiler']} {result2['options']}",
+            lineterm="",
+        )
+    )
+
+
 def _analyze_execution_differences(
     results: List[Dict[str, Any]],
 ) -> Tuple[List[str], Dict[str, Any]]:
@@ -724,8 +811,8 @@ def _analyze_execution_differences(
         return [], {}
 
     result1, result2 = results[0], results[1]
-    differences = []
-    diff_details = {}
+    differences: List[str] = []
+    diff_details: Dict[str, Any] = {}
 
     # Compare compilation status
     comp1, comp2 = result1["compiled"], result2["compiled"]
@@ -754,57 +841,9 @@ def _analyze_execution_differences(
         if exit1 != exit2:
             differences.append(f"Exit codes differ: {result1['compiler']}={exit1}, {result2['compiler']}={exit2}")
 
-        # Compare stdout
-        stdout1, stdout2 = result1["stdout"], result2["stdout"]
-        if stdout1 != stdout2:
-            stdout_lines1 = stdout1.splitlines()
-            stdout_lines2 = stdout2.splitlines()
-
-            if len(stdout_lines1) != len(stdout_lines2):
-                diff_lines = len(stdout_lines2) - len(stdout_lines1)
-                if diff_lines > 0:
-                    differences.append(f"Stdout differs: {result2['compiler']} output has {diff_lines} more lines")
-                else:
-                    differences.append(f"Stdout differs: {result1['compiler']} output has {abs(diff_lines)} more lines")
-            else:
-                differences.append("Stdout content differs")
-
-            # Generate unified diff for stdout
-            diff_details["stdout_diff"] = "\n".join(
-                difflib.unified_diff(
-                    stdout_lines1,
-                    stdout_lines2,
-                    fromfile=f"{result1['compiler']} {result1['options']}",
-                    tofile=f"{result2['compiler']} {result2['options']}",
-                    lineterm="",
-                )
-            )
-
-        # Compare stderr
-        stderr1, stderr2 = result1["stderr"], result2["stderr"]
-        if stderr1 != stderr2:
-            stderr_lines1 = stderr1.splitlines()
-            stderr_lines2 = stderr2.splitlines()
-
-            if len(stderr_lines1) != len(stderr_lines2):
-                diff_lines = len(stderr_lines2) - len(stderr_lines1)
-                if diff_lines > 0:
-                    differences.append(f"Stderr differs: {result2['compiler']} output has {diff_lines} more lines")
-                else:
-                    differences.append(f"Stderr differs: {result1['compiler']} output has {abs(diff_lines)} more lines")
-            else:
-                differences.append("Stderr content differs")
-
-            # Generate unified diff for stderr
-            diff_details["stderr_diff"] = "\n".join(
-                difflib.unified_diff(
-                    stderr_lines1,
-                    stderr_lines2,
-                    fromfile=f"{result1['compiler']} {result1['options']}",
-                    tofile=f"{result2['compiler']} {result2['options']}",
-                    lineterm="",
-                )
-            )
+        # Compare stdout and stderr
+        for stream in ("stdout", "stderr"):
+            _compare_output_stream(stream, result1, result2, differences, diff_details)
 
     # Add summary
     if diff_details:
@@ -818,6 +857,27 @@ def _analyze_execution_differences(
     return differences, diff_details
 
 
+# Maximum number of compilations compare_compilers has in flight at once
+_COMPARE_CONCURRENCY = 4
+
+
+def _compare_cache_key(
+    endpoint: str,
+    source: str,
+    language: str,
+    compiler_id: str,
+    options: str,
+    libraries: List[Dict[str, str]],
+    comparison_type: str,
+    filters: Dict[str, Any],
+) -> bytes:
+    """Hash the inputs of one compare_compilers compilation into a compact cache key."""
+    key = json.dumps(
+        [endpoint, source, language, compiler_id, options, libraries, comparison_type, filters], sort_keys=True
+    )
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
 async def compare_compilers(arguments: Dict[str, Any], config: Config) -> Dict[str, Any]:
     """Compare output across different compilers, optimization levels, and options.
 
@@ -846,6 +906,10 @@ async def compare_compilers(arguments: Dict[str, Any], config: Config) -> Dict[s
     - **execution**: Compare program outputs and execution results
     - **diagnostics**: Compare compiler warnings and error messages
 
+    Assembly and diagnostics results are cached for an hour per unique source, compiler,
+    options and libraries, so repeating a comparison does not recompile. Execution
+    comparisons always run the program again.
+
     **For assembly comparisons, provides:**
     - Unified diffs showing line-by-line changes
     - Statistics on instructions added/removed and function calls
@@ -900,38 +964,40 @@ async def compare_compilers(arguments: Dict[str, Any], config: Config) -> Dict[s
     comparison_type = arguments["comparison_type"]
     libraries = arguments.get("libraries")
 
-    # Import assembly diff utilities
-
-    client = CompilerExplorerClient(config)
-
-    try:
-        # Resolve libraries if provided
-        resolved_libraries = []
-        if libraries:
+    client = await _get_client(config)
+
+    # Resolve libraries if provided, validating them against the first compiler
+    resolved_libraries = (
+        await _resolve_libraries(libraries, language, config.resolve_compiler(compilers[0]["id"]), client)
+        if libraries
+        else []
+    )
+
+    semaphore = asyncio.Semaphore(_COMPARE_CONCURRENCY)
+
+    async def compare_one(compiler_id: str, options: str) -> Tuple[Dict[str, Any], List[str]]:
+        """Compile one configuration, returning its result entry and its assembly lines (if any)."""
+        entry: Dict[str, Any]
+        asm_lines: List[str] = []
+        cache_key = None
+        if comparison_type != "execution":
+            cache_key = _compare_cache_key(
+                config.api.endpoint,
+                source,
+                language,
+                compiler_id,
+                options,
+                resolved_libraries,
+                comparison_type,
+                # The output filters shape the assembly, and the cache is shared by every Config
+                config.filters.model_dump(),
+            )
+            cached_entry = _compare_cache.get(cache_key)
+            if cached_entry and (time.monotonic() - cached_entry[0]) < _COMPARE_CACHE_TTL:
+                return cached_entry[1]
 
-            try:
-                # Use first compiler for library validation
-                first_compiler = config.resolve_compiler(compilers[0]["id"])
-                resolved_libraries = await validate_and_resolve_libraries(libraries, language, first_compiler, client)
-            except LibraryError as e:
-                # Try to provide helpful suggestions for library errors
-                if isinstance(e, LibraryNotFoundError):
-                    # Extract the library name from the error for suggestions
-                    error_msg = str(e)
-                    if "'" in error_msg:
-                        lib_name = error_msg.split("'")[1]
-                        suggestions = await search_libraries(lib_name, language, client)
-                        enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
-                        raise LibraryError(enhanced_error)
-                raise
-
-        results = []
-
-        for comp_config in compilers:
-            compiler_id = config.resolve_compiler(comp_config["id"])
-            options = comp_config.get("options", "")
-
-            if comparison_type == "execution":
+        if comparison_type == "execution":
+            async with semaphore:
                 result = await client.compile_and_execute(
                     source,
                     language,
@@ -941,47 +1007,20 @@ async def compare_compilers(arguments: Dict[str, Any], config: Config) -> Dict[s
                     tools=None,
                 )
 
-                # Handle different API response formats (same as compile_and_run_tool)
-                build_result = result.get("buildResult", result)
-                compiled = build_result.get("code", 1) == 0
-
-                # Check for execution results
-                executed = result.get("didExecute", False) or "execResult" in result
-                exit_code = result.get("code", -1)
-
-                # Handle stdout/stderr from different locations
-                if compiled:
-                    # For successful compilation, execution stdout/stderr is at top level
-                    stdout = result.get("stdout", "")
-                    stderr = result.get("stderr", "")
-                else:
-                    # For failed compilation, get stdout from buildResult
-                    stdout = build_result.get("stdout", "")
-                    # Collect stderr from all possible locations
-                    stderr = _collect_all_stderr(result)
-
-                # Convert arrays to strings for both stdout and stderr
-                if isinstance(stdout, list):
-                    stdout = "".join(item.get("text", "") if isinstance(item, dict) else str(item) for item in stdout)
-
-                # stderr is already processed by _collect_all_stderr for compilation failures
-                if compiled and isinstance(stderr, list):
-                    stderr = "".join(item.get("text", "") if isinstance(item, dict) else str(item) for item in stderr)
-
-                results.append(
-                    {
-                        "compiler": compiler_id,
-                        "options": options,
-                        "compiled": compiled,
-                        "executed": executed,
-                        "exit_code": exit_code,
-                        "stdout": stdout,
-                        "stderr": stderr,
-                        "assembly_size": 0,
-                        "warnings": 0,
-                    }
-                )
-            elif comparison_type == "assembly":
+            compiled, executed, exit_code, stdout, stderr = _execution_outcome(result)
+            entry = {
+                "compiler": compiler_id,
+                "options": options,
+                "compiled": compiled,
+                "executed": executed,
+                "exit_code": exit_code,
+                "stdout": stdout,
+                "stderr": stderr,
+                "assembly_size": 0,
+                "warnings": 0,
+            }
+        elif comparison_type == "assembly":
+            async with semaphore:
                 result = await client.compile(
                     source,
                     language,
@@ -990,38 +1029,51 @@ async def compare_compilers(arguments: Dict[str, Any], config: Config) -> Dict[s
                     get_assembly=True,
                     libraries=resolved_libraries,
                 )
-                # Extract assembly text
-                asm = result.get("asm", "")
-                if isinstance(asm, list):
-                    asm = "\n".join(item.get("text", "") for item in asm if isinstance(item, dict))
-
-                results.append(
-                    {
-                        "compiler": compiler_id,
-                        "options": options,
-                        "execution_result": "",
-                        "assembly": asm,  # Store full assembly for diff
-                        "assembly_size": len(asm.splitlines()),
-                        "warnings": len(
-                            [d for d in result.get("stderr", []) if "warning" in d.get("text", "").lower()]
-                        ),
-                    }
-                )
-            else:  # diagnostics
+            # Extract assembly lines
+            asm = result.get("asm", "")
+            if isinstance(asm, list):
+                try:
+                    asm_lines = [item["text"] for item in asm]
+                except (KeyError, TypeError):
+                    asm_lines = [item.get("text", "") for item in asm if isinstance(item, dict)]
+            else:
+                asm_lines = asm.splitlines()
+
+            entry = {
+                "compiler": compiler_id,
+                "options": options,
+                "execution_result": "",
+                "assembly_size": len(asm_lines),
+                "warnings": _count_warnings(result.get("stderr", ())),
+            }
+        else:  # diagnostics
+            async with semaphore:
                 result = await client.compile(source, language, compiler_id, options, libraries=resolved_libraries)
-                results.append(
-                    {
-                        "compiler": compiler_id,
-                        "options": options,
-                        "execution_result": "",
-                        "assembly_size": 0,
-                        "warnings": len(
-                            [d for d in result.get("stderr", []) if "warning" in d.get("text", "").lower()]
-                        ),
-                    }
-                )
-    finally:
-        await client.close()
+            entry = {
+                "compiler": compiler_id,
+                "options": options,
+                "execution_result": "",
+                "assembly_size": 0,
+                "warnings": _count_warnings(result.get("stderr", ())),
+            }
+
+        # CE marks infrastructure failures as not cacheable; a timed-out compile may succeed on retry
+        if cache_key is not None and result.get("okToCache") is not False and not result.get("timedOut"):
+            # Evict the oldest entry once full; a re-stored key moves to the end
+            _compare_cache.pop(cache_key, None)
+            if len(_compare_cache) >= _COMPARE_CACHE_MAX_ENTRIES:
+                del _compare_cache[next(iter(_compare_cache))]
+            _compare_cache[cache_key] = (time.monotonic(), (entry, asm_lines))
+
+        return entry, asm_lines
+
+    # Compile all configurations concurrently; identical compiler/options pairs are only compiled once
+    config_keys = [(config.resolve_compiler(comp["id"]), comp.get("options", "")) for comp in compilers]
+    unique_keys = list(dict.fromkeys(config_keys))
+    entries = dict(zip(unique_keys, await asyncio.gather(*(compare_one(*key) for key in unique_keys))))
+    results = [dict(entries[key][0]) for key in config_keys]
+    # Full assembly is kept out of the results and only used for the diff
+    assemblies = [entries[key][1] for key in config_keys]
 
     # Generate differences summary
     differences = []
@@ -1039,18 +1091,17 @@ async def compare_compilers(arguments: Dict[str, Any], config: Config) -> Dict[s
                 )
 
             # Generate assembly diff
-            if "assembly" in results[0] and "assembly" in results[1]:
-                assembly_diff = generate_assembly_diff(
-                    results[0]["assembly"],
-                    results[1]["assembly"],
-                    label1=f"{results[0]['compiler']} {results[0]['options']}",
-                    label2=f"{results[1]['compiler']} {results[1]['options']}",
-                    context=3,
-                )
+            assembly_diff = generate_assembly_diff(
+                assemblies[0],
+                assemblies[1],
+                label1=f"{results[0]['compiler']} {results[0]['options']}",
+                label2=f"{results[1]['compiler']} {results[1]['options']}",
+                context=3,
+            )
 
-                # Add diff summary to differences
-                if assembly_diff and "summary" in assembly_diff:
-                    differences.append(assembly_diff["summary"])
+            # Add diff summary to differences
+            if assembly_diff and "summary" in assembly_diff:
+                differences.append(assembly_diff["summary"])
 
         elif comparison_type == "execution":
             # Use detailed execution analysis
@@ -1065,10 +1116,6 @@ async def compare_compilers(arguments: Dict[str, Any], config: Config) -> Dict[s
                     f"{results[1]['compiler']} produces {abs(warn_diff)} {'fewer' if warn_diff > 0 else 'more'} warnings"
                 )
 
-    # Remove assembly from results to keep response concise
-    for result in results:
-        result.pop("assembly", None)
-
     response = {
         "results": results,
         "differences": differences,
@@ -1079,8 +1126,8 @@ async def compare_compilers(arguments: Dict[str, Any], config: Config) -> Dict[s
         response["assembly_diff"] = {
             "statistics": assembly_diff["statistics"],
             "summary": assembly_diff["summary"],
-            # Include truncated unified diff
-            "unified_diff": "\n".join(assembly_diff["unified_diff"].splitlines()[:50]) + "\n... (truncated)",
+            # Include truncated unified diff; the bounded split stops after the first 50 lines
+            "unified_diff": "\n".join(assembly_diff["unified_diff"].split("\n", 50)[:50]) + "\n... (truncated)",
         }
 
     # Add execution diff details if available
@@ -1102,45 +1149,27 @@ async def generate_share_url(arguments: Dict[str, Any], config: Config) -> Dict[
     create_binary = arguments.get("create_binary", False)
     create_object_only = arguments.get("create_object_only", False)
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
-    try:
-        # Resolve libraries if provided
-        resolved_libraries = []
-        if libraries:
+    # Resolve libraries if provided
+    resolved_libraries = await _resolve_libraries(libraries, language, compiler, client)
 
-            try:
-                resolved_libraries = await validate_and_resolve_libraries(libraries, language, compiler, client)
-            except LibraryError as e:
-                # Try to provide helpful suggestions for library errors
-                if isinstance(e, LibraryNotFoundError):
-                    # Extract the library name from the error for suggestions
-                    error_msg = str(e)
-                    if "'" in error_msg:
-                        lib_name = error_msg.split("'")[1]
-                        suggestions = await search_libraries(lib_name, language, client)
-                        enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
-                        raise LibraryError(enhanced_error)
-                raise
-
-        # Validate tools if provided
-        validated_tools = tools
-        if tools:
-            validated_tools, _ = await validate_tools_for_compiler(tools, compiler, language, client)
-
-        url = await client.create_short_link(
-            source,
-            language,
-            compiler,
-            options,
-            layout,
-            resolved_libraries,
-            validated_tools,
-            create_binary,
-            create_object_only,
-        )
-    finally:
-        await client.close()
+    # Validate tools if provided
+    validated_tools = tools
+    if tools:
+        validated_tools, _ = await validate_tools_for_compiler(tools, compiler, language, client)
+
+    url = await client.create_short_link(
+        source,
+        language,
+        compiler,
+        options,
+        layout,
+        resolved_libraries,
+        validated_tools,
+        create_binary,
+        create_object_only,
+    )
 
     return {"url": url}
 
@@ -1158,10 +1187,57 @@ async def find_compilers(arguments: Dict[str, Any], config: Config) -> Dict[str,
     include_overrides = arguments.get("include_overrides", False)
     include_runtime_tools = arguments.get("include_runtime_tools", False)
     include_compile_tools = arguments.get("include_compile_tools", False)
+    # The experimental filter in effect, if any (proposal takes precedence over feature and category)
+    experimental_filter = proposal or feature or category
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
-    try:
+    # If no filters provided, categorize all experimental compilers
+    if (not experimental_filter and not search_text) or show_all:
+        compilers = await client.get_compilers(language, include_extended_info=True)
+        categorized = compiler_finder.categorize_compilers(compilers)
+
+        # Fetch version info for all nightly compilers in one concurrent batch
+        await fetch_version_info_for_compilers(list(chain.from_iterable(categorized.values())), client)
+
+        result: Dict[str, Any] = {
+            "summary": {
+                "language": language,
+            },
+            "categories": {},
+        }
+
+        total_experimental = 0
+        for cat_name, cat_compilers in categorized.items():
+            # Apply text filter to category compilers
+            filtered_compilers = apply_text_filter(cat_compilers, search_text, exact_search)
+
+            if filtered_compilers:  # Only include categories with matching compilers
+                total_experimental += len(filtered_compilers)
+                result["categories"][cat_name] = {
+                    "count": len(filtered_compilers),
+                    "compilers": [
+                        format_compiler_info(
+                            comp,
+                            ids_only,
+                            include_overrides,
+                            include_runtime_tools,
+                            include_compile_tools,
+                        )
+                        for comp in filtered_compilers
+                    ],
+                }
+
+        # Update summary with final counts
+        result["summary"].update(
+            {
+                "total_experimental": total_experimental,
+                "categories_found": len(result["categories"]),
+                "filter_used": search_text,
+            }
+        )
+
+    else:
         experimental_compilers = await search_experimental_compilers(
             language=language,
             client=client,
@@ -1171,117 +1247,55 @@ async def find_compilers(arguments: Dict[str, Any], config: Config) -> Dict[str,
             fetch_versions=True,
         )
 
-        # If no filters provided, categorize all experimental compilers
-        if (not any([proposal, feature, category]) and not search_text) or show_all:
-            compilers = await client.get_compilers(language, include_extended_info=True)
-            finder = ExperimentalCompilerFinder()
-            categorized = finder.categorize_compilers(compilers)
-
-            # Fetch version info for all nightly compilers
+        # Apply text filter to experimental compilers
+        filtered_experimental = apply_text_filter(experimental_compilers, search_text, exact_search)
 
-            for cat_compilers in categorized.values():
-                await fetch_version_info_for_compilers(cat_compilers, client)
-
-            result: Dict[str, Any] = {
-                "summary": {
-                    "language": language,
-                },
-                "categories": {},
-            }
-
-            for cat_name, cat_compilers in categorized.items():
-                # Apply text filter to category compilers
-                filtered_compilers = apply_text_filter(cat_compilers, search_text, exact_search)
-
-                if filtered_compilers:  # Only include categories with matching compilers
-                    result["categories"][cat_name] = {
-                        "count": len(filtered_compilers),
-                        "compilers": [
-                            format_compiler_info(
-                                comp,
-                                ids_only,
-                                include_overrides,
-                                include_runtime_tools,
-                                include_compile_tools,
-                            )
-                            for comp in filtered_compilers
-                        ],
-                    }
+        # Return filtered results
+        result = {
+            "summary": {
+                "total_found": len(filtered_experimental),
+                "language": language,
+                "filter_used": experimental_filter or search_text,
+            },
+            "compilers": [
+                format_compiler_info(
+                    comp,
+                    ids_only,
+                    include_overrides,
+                    include_runtime_tools,
+                    include_compile_tools,
+                    include_category=True,
+                )
+                for comp in filtered_experimental
+            ],
+        }
 
-            # Update summary with final counts
-            result["summary"].update(
-                {
-                    "total_experimental": sum(len(cat_data["compilers"]) for cat_data in result["categories"].values()),
-                    "categories_found": len(result["categories"]),
-                    "filter_used": search_text,
-                }
+    # Add usage examples
+    if proposal and not ids_only:
+        # Get example compilers from the results
+        example_compilers = []
+        if "compilers" in result:
+            example_compilers = [comp["id"] for comp in islice(result["compilers"], 3) if isinstance(comp, dict)]
+        elif "categories" in result:
+            example_compilers = list(
+                islice(
+                    (
+                        comp["id"]
+                        for cat_data in result["categories"].values()
+                        for comp in islice(cat_data["compilers"], 3)
+                        if isinstance(comp, dict)
+                    ),
+                    3,
+                )
             )
 
-        else:
-            # Apply text filter to experimental compilers
-            filtered_experimental = apply_text_filter(experimental_compilers, search_text, exact_search)
-
-            # Return filtered results
-            result = {
-                "summary": {
-                    "total_found": len(filtered_experimental),
-                    "language": language,
-                    "filter_used": proposal or feature or category or search_text,
-                },
-                "compilers": [
-                    (
-                        {
-                            **cast(
-                                Dict[str, Any],
-                                format_compiler_info(
-                                    comp,
-                                    False,  # ids_only=False for dict unpacking
-                                    include_overrides,
-                                    include_runtime_tools,
-                                    include_compile_tools,
-                                ),
-                            ),
-                            "category": comp.category,
-                        }
-                        if not ids_only
-                        else format_compiler_info(
-                            comp,
-                            True,  # ids_only=True for string return
-                            include_overrides,
-                            include_runtime_tools,
-                            include_compile_tools,
-                        )
-                    )
-                    for comp in filtered_experimental
-                ],
+        if example_compilers:
+            result["usage_example"] = {
+                "description": f"To use {proposal} features with the found compiler(s)",
+                "example_compilers": example_compilers,
             }
 
-        # Add usage examples
-        if proposal and not ids_only:
-            # Get example compilers from the results
-            example_compilers = []
-            if "compilers" in result:
-                example_compilers = [comp["id"] for comp in result["compilers"][:3] if isinstance(comp, dict)]
-            elif "categories" in result:
-                for cat_data in result["categories"].values():
-                    for comp in cat_data["compilers"][:3]:
-                        if isinstance(comp, dict) and len(example_compilers) < 3:
-                            example_compilers.append(comp["id"])
-                        if len(example_compilers) >= 3:
-                            break
-                    if len(example_compilers) >= 3:
-                        break
-
-            if example_compilers:
-                result["usage_example"] = {
-                    "description": f"To use {proposal} features with the found compiler(s)",
-                    "example_compilers": example_compilers,
-                }
-
-        return result
-
-    finally:
-        await client.close()
+    return result
 
 
 async def get_libraries_list(arguments: Dict[str, Any], config: Config) -> Dict[str, Any]:
@@ -1289,7 +1303,7 @@ async def get_libraries_list(arguments: Dict[str, Any], config: Config) -> Dict[
     language = arguments.get("language", "c++")
     search_text = arguments.get("search_text")
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
     try:
         libraries = await client.get_libraries_list(language, search_text)
@@ -1308,9 +1322,6 @@ async def get_libraries_list(arguments: Dict[str, Any], config: Config) -> Dict[
             "search_text": search_text,
         }
 
-    finally:
-        await client.close()
-
 
 async def get_library_details_info(arguments: Dict[str, Any], config: Config) -> Dict[str, Any]:
     """Get detailed information for a specific library."""
@@ -1320,7 +1331,7 @@ async def get_library_details_info(arguments: Dict[str, Any], config: Config) ->
     if not library_id:
         return {"error": "library_id parameter is required", "language": language}
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
     try:
         library = await client.get_library_details(language, library_id)
@@ -1341,9 +1352,6 @@ async def get_library_details_info(arguments: Dict[str, Any], config: Config) ->
             "library_id": library_id,
         }
 
-    finally:
-        await client.close()
-
 
 async def download_shortlink(arguments: Dict[str, Any], config: Config) -> Dict[str, Any]:
     """Download and save source code from a Compiler Explorer shortlink."""
@@ -1370,7 +1378,7 @@ async def download_shortlink(arguments: Dict[str, Any], config: Config) -> Dict[
     except Exception as e:
         return {"error": f"Invalid destination path: {str(e)}"}
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
     try:
         # Get shortlink information
@@ -1588,15 +1596,12 @@ async def download_shortlink(arguments: Dict[str, Any], config: Config) -> Dict[
     except Exception as e:
         return {"error": f"Failed to download shortlink: {str(e)}"}
 
-    finally:
-        await client.close()
-
 
 async def get_languages_list(arguments: Dict[str, Any], config: Config) -> Dict[str, Any]:
     """Get simplified list of languages (id, name and extensions only) with optional search."""
     search_text = arguments.get("search_text")
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
     try:
         languages = await client.get_languages_list(search_text)
@@ -1610,9 +1615,6 @@ async def get_languages_list(arguments: Dict[str, Any], config: Config) -> Dict[
     except Exception as e:
         return {"error": f"Failed to get languages: {str(e)}"}
 
-    finally:
-        await client.close()
-
 
 # Instruction set aliases for smart resolution
 INSTRUCTION_SET_ALIASES = {
@@ -1704,7 +1706,7 @@ async def lookup_instruction(arguments: Dict[str, Any], config: Config) -> Dict[
     # Resolve instruction set aliases
     resolved_instruction_set = resolve_instruction_set(instruction_set)
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
     try:
         # Get instruction documentation
@@ -1732,9 +1734,6 @@ async def lookup_instruction(arguments: Dict[str, Any], config: Config) -> Dict[
             "found": False,
         }
 
-    finally:
-        await client.close()
-
 
 # Regex pattern to strip ANSI escape codes
 _ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
@@ -1748,7 +1747,7 @@ def _strip_ansi(text: str) -> str:
 def _extract_build_step_text(items: Any) -> str:
     """Extract text from build step stdout/stderr arrays."""
     if isinstance(items, list):
-        return "\n".join(_strip_ansi(item.get("text", "") if isinstance(item, dict) else str(item)) for item in items)
+        return "\n".join(_strip_ansi(_output_item_text(item)) for item in items)
     if isinstance(items, str):
         return _strip_ansi(items)
     return ""
@@ -1845,41 +1844,26 @@ async def cmake_build(arguments: Dict[str, Any], config: Config) -> Dict[str, An
     execute = arguments.get("execute", False)
     libraries = arguments.get("libraries")
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
-    try:
-        # Resolve libraries if provided
-        resolved_libraries: List[Dict[str, str]] = []
-        if libraries:
-            try:
-                resolved_libraries = await validate_and_resolve_libraries(libraries, language, compiler, client)
-            except LibraryError as e:
-                if isinstance(e, LibraryNotFoundError):
-                    error_msg = str(e)
-                    if "'" in error_msg:
-                        lib_name = error_msg.split("'")[1]
-                        suggestions = await search_libraries(lib_name, language, client)
-                        enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
-                        raise LibraryError(enhanced_error)
-                raise
-
-        result = await client.cmake_build(
-            cmake_source=cmake_source,
-            files=files,
-            language=language,
-            compiler=compiler,
-            options=options,
-            cmake_args=cmake_args,
-            execute=execute,
-            libraries=resolved_libraries,
-        )
-    finally:
-        await client.close()
+    # Resolve libraries if provided
+    resolved_libraries = await _resolve_libraries(libraries, language, compiler, client)
+
+    result = await client.cmake_build(
+        cmake_source=cmake_source,
+        files=files,
+        language=language,
+        compiler=compiler,
+        options=options,
+        cmake_args=cmake_args,
+        execute=execute,
+        libraries=resolved_libraries,
+    )
 
     # Parse build steps
     build_steps = []
     all_succeeded = True
-    for step in result.get("buildsteps", []):
+    for step in result.get("buildsteps", ()):
         step_code = step.get("code", -1)
         if step_code != 0:
             all_succeeded = False
@@ -1924,34 +1908,19 @@ async def generate_cmake_share_url(arguments: Dict[str, Any], config: Config) ->
     cmake_args = arguments.get("cmake_args", "")
     libraries = arguments.get("libraries")
 
-    client = CompilerExplorerClient(config)
+    client = await _get_client(config)
 
-    try:
-        # Resolve libraries if provided
-        resolved_libraries: List[Dict[str, str]] = []
-        if libraries:
-            try:
-                resolved_libraries = await validate_and_resolve_libraries(libraries, language, compiler, client)
-            except LibraryError as e:
-                if isinstance(e, LibraryNotFoundError):
-                    error_msg = str(e)
-                    if "'" in error_msg:
-                        lib_name = error_msg.split("'")[1]
-                        suggestions = await search_libraries(lib_name, language, client)
-                        enhanced_error = format_library_error_with_suggestions(e, lib_name, language, suggestions)
-                        raise LibraryError(enhanced_error)
-                raise
-
-        url = await client.create_cmake_short_link(
-            cmake_source=cmake_source,
-            files=files,
-            language=language,
-            compiler=compiler,
-            options=options,
-            cmake_args=cmake_args,
-            libraries=resolved_libraries,
-        )
-    finally:
-        await client.close()
+    # Resolve libraries if provided
+    resolved_libraries = await _resolve_libraries(libraries, language, compiler, client)
+
+    url = await client.create_cmake_short_link(
+        cmake_source=cmake_source,
+        files=files,
+        language=language,
+        compiler=compiler,
+        options=options,
+        cmake_args=cmake_args,
+        libraries=resolved_libraries,
+    )
 
     return {"url": url}
@@ -6,6 +6,18 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
+# Compile directive patterns for different comment styles, checked in order on each line
+_COMPILE_DIRECTIVE_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"//\s*(?:compile|flags):\s*(.+)$",  # C++ style
+        r"/\*\s*(?:compile|flags):\s*(.+)\*/",  # C style
+        r"\{\s*(?:compile|flags):\s*(.+)\}",  # Pascal style
+        r"#\s*(?:compile|flags):\s*(.+)$",  # Python/Shell style
+        r"--\s*(?:compile|flags):\s*(.+)$",  # SQL/Haskell style
+    )
+)
+
 
 def extract_compile_args_from_source(source_code: str, language: str) -> Optional[str]:
     """
@@ -14,20 +26,16 @@ def extract_compile_args_from_source(source_code: str, language: str) -> Optiona
     Looks for 'compile:' or 'flags:' directives in the first 10 lines.
     Supports both C++ (//) and Pascal ({}) comment styles.
     """
-    lines = source_code.split("\n")[:10]
-
-    # Patterns for different comment styles
-    patterns = [
-        r"//\s*(?:compile|flags):\s*(.+)$",  # C++ style
-        r"/\*\s*(?:compile|flags):\s*(.+)\*/",  # C style
-        r"\{\s*(?:compile|flags):\s*(.+)\}",  # Pascal style
-        r"#\s*(?:compile|flags):\s*(.+)$",  # Python/Shell style
-        r"--\s*(?:compile|flags):\s*(.+)$",  # SQL/Haskell style
-    ]
+    # Only split off the lines we look at, so the cost doesn't grow with the source size
+    lines = source_code.split("\n", 10)[:10]
 
     for line in lines:
-        for pattern in patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
+        # Every directive contains "compile:" or "flags:", so skip the regexes for all other lines
+        line_lower = line.lower()
+        if "compile:" not in line_lower and "flags:" not in line_lower:
+            continue
+        for pattern in _COMPILE_DIRECTIVE_PATTERNS:
+            match = pattern.search(line)
             if match:
                 return match.group(1).strip()
 
@@ -53,10 +61,14 @@ def truncate_output(text: str, max_lines: int, max_line_length: int = 200) -> tu
 
     Returns (truncated_text, was_truncated).
     """
-    lines = text.splitlines()
-    was_truncated = False
-
-    # Truncate number of lines
+    # Only split off the lines that can be kept, so the cost doesn't grow with the output size
+    head = text.split("\n", max_lines)
+    rest = head[max_lines] if len(head) > max_lines else ""
+    lines = text[: len(text) - len(rest)].splitlines()
+    # Anything after the last kept newline is at least one more line
+    was_truncated = rest != ""
+
+    # Truncate number of lines (splitlines also breaks on separators other than "\n")
     if len(lines) > max_lines:
         lines = lines[:max_lines]
         was_truncated = True
@@ -77,6 +89,13 @@ def truncate_output(text: str, max_lines: int, max_line_length: int = 200) -> tu
     return result, was_truncated
 
 
+# Pre-colored labels for the common diagnostic types; anything else is shown in blue
+_DIAGNOSTIC_LABELS = {
+    "error": f"{Colors.RED}ERROR{Colors.NC}",
+    "warning": f"{Colors.YELLOW}WARNING{Colors.NC}",
+}
+
+
 def format_diagnostics(diagnostics: list) -> str:
     """Format compiler diagnostics for display."""
     if not diagnostics:
@@ -89,14 +108,8 @@ def format_diagnostics(diagnostics: list) -> str:
         column = diag.get("column", 0)
         message = diag.get("message", "")
 
-        if diag_type == "error":
-            color = Colors.RED
-        elif diag_type == "warning":
-            color = Colors.YELLOW
-        else:
-            color = Colors.BLUE
-
-        formatted.append(f"{color}{diag_type.upper()}{Colors.NC} at {line}:{column}: {message}")
+        label = _DIAGNOSTIC_LABELS.get(diag_type) or f"{Colors.BLUE}{diag_type.upper()}{Colors.NC}"
+        formatted.append(f"{label} at {line}:{column}: {message}")
 
     return "\n".join(formatted)
 
@@ -150,8 +163,9 @@ def format_compiler_info(
     include_overrides: bool = False,
     include_runtime_tools: bool = False,
     include_compile_tools: bool = False,
+    include_category: bool = False,
 ) -> Union[str, Dict[str, Any]]:
-    """Format compiler info with optional ids_only mode, overrides, and tools."""
+    """Format compiler info with optional ids_only mode, overrides, tools, and category."""
     if ids_only:
         return str(comp.id)
 
@@ -185,6 +199,9 @@ def format_compiler_info(
             # Handle case where tools is a list
             info["tools"] = comp.tools
 
+    if include_category:
+        info["category"] = comp.category
+
     return info
 
 
@@ -219,6 +236,34 @@ def extract_link_id(shortlink_url: str) -> str:
         raise ValueError(f"Invalid shortlink URL format: {shortlink_url}") from e
 
 
+# Static fallback mapping for common languages
+_FALLBACK_EXTENSIONS = {
+    "c++": ".cpp",
+    "cpp": ".cpp",
+    "c": ".c",
+    "rust": ".rs",
+    "go": ".go",
+    "python": ".py",
+    "java": ".java",
+    "javascript": ".js",
+    "typescript": ".ts",
+    "kotlin": ".kt",
+    "swift": ".swift",
+    "pascal": ".pas",
+    "fortran": ".f90",
+    "assembly": ".s",
+    "haskell": ".hs",
+    "csharp": ".cs",
+    "fsharp": ".fs",
+    "d": ".d",
+    "nim": ".nim",
+    "zig": ".zig",
+    "v": ".v",
+    "ada": ".adb",
+    "cobol": ".cob",
+}
+
+
 async def get_language_extension(language: str, client: Optional[Any] = None) -> str:
     """
     Get the primary file extension for a language from CE's languages API.
@@ -230,13 +275,14 @@ async def get_language_extension(language: str, client: Optional[Any] = None) ->
     Returns:
         File extension (with dot) for the language
     """
+    language_lower = language.lower()
     if client:
         try:
             languages = await client.get_languages()
 
             # Find matching language (case-insensitive)
             for lang_data in languages:
-                if lang_data.get("id", "").lower() == language.lower():
+                if lang_data.get("id", "").lower() == language_lower:
                     extensions = lang_data.get("extensions", [])
                     if extensions:
                         # Return the first extension as primary
@@ -245,34 +291,7 @@ async def get_language_extension(language: str, client: Optional[Any] = None) ->
             # Fall back to static mapping if API fails
             pass
 
-    # Static fallback mapping for common languages
-    extension_map = {
-        "c++": ".cpp",
-        "cpp": ".cpp",
-        "c": ".c",
-        "rust": ".rs",
-        "go": ".go",
-        "python": ".py",
-        "java": ".java",
-        "javascript": ".js",
-        "typescript": ".ts",
-        "kotlin": ".kt",
-        "swift": ".swift",
-        "pascal": ".pas",
-        "fortran": ".f90",
-        "assembly": ".s",
-        "haskell": ".hs",
-        "csharp": ".cs",
-        "fsharp": ".fs",
-        "d": ".d",
-        "nim": ".nim",
-        "zig": ".zig",
-        "v": ".v",
-        "ada": ".adb",
-        "cobol": ".cob",
-    }
-
-    return extension_map.get(language.lower(), ".txt")
+    return _FALLBACK_EXTENSIONS.get(language_lower, ".txt")
 
 
 async def generate_filename(
@@ -0,0 +1,13 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+from ce_mcp.tools import close_shared_clients
+
+
+@pytest.fixture
+async def reset_shared_clients():
+    """Run a test without shared API clients or cached comparisons left over from another test."""
+    await close_shared_clients()
+    yield
+    await close_shared_clients()
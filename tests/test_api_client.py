@@ -51,6 +51,30 @@ class TestCompilerExplorerClient:
         # Verify request was made
         assert len(mock_api.requests) == 1
 
+    @pytest.mark.asyncio
+    async def test_compile_request_with_files(self, client, mock_api):
+        """Test extra files are sent in the same compilation request."""
+        mock_api.post("https://godbolt.org/api/compiler/g132/compile", payload={"code": 0})
+        files = [{"filename": "util.h", "contents": "int util();"}]
+
+        await client.compile(source='#include "util.h"', language="c++", compiler="g132", files=files)
+
+        (request,) = next(iter(mock_api.requests.values()))
+        assert request.kwargs["json"]["files"] == files
+
+    @pytest.mark.asyncio
+    async def test_compile_skips_assembly_unless_requested(self, client, mock_api):
+        """Test assembly is only requested from the API when get_assembly is set."""
+        url = "https://godbolt.org/api/compiler/g132/compile"
+        mock_api.post(url, payload={"code": 0}, repeat=True)
+
+        await client.compile(source="int main() {}", language="c++", compiler="g132")
+        await client.compile(source="int main() {}", language="c++", compiler="g132", get_assembly=True)
+
+        diagnostics_only, with_assembly = next(iter(mock_api.requests.values()))
+        assert diagnostics_only.kwargs["json"]["options"]["compilerOptions"]["skipAsm"] is True
+        assert with_assembly.kwargs["json"]["options"]["compilerOptions"]["skipAsm"] is False
+
     @pytest.mark.asyncio
     async def test_compile_with_execution(self, client, mock_api):
         """Test compilation with execution."""
@@ -97,6 +121,9 @@ class TestCompilerExplorerClient:
         assert len(languages) == 3
         assert languages[0]["id"] == "c++"
 
+        # A second call is served from the cache without another request
+        assert await client.get_languages() is languages
+
     @pytest.mark.asyncio
     async def test_get_languages_list(self, client, mock_api):
         """Test fetching simplified languages list."""
@@ -148,6 +175,28 @@ class TestCompilerExplorerClient:
         assert len(compilers) == 2
         assert compilers[0]["id"] == "g132"
 
+        # Second call is served from the cache (the mocked URL only matches once)
+        assert await client.get_compilers("c++") is compilers
+
+    @pytest.mark.asyncio
+    async def test_get_compilers_refresh_callback(self, mock_api):
+        """Test the refresh callback runs only when an extended compiler list is fetched."""
+        import re
+
+        refreshed = []
+        client = CompilerExplorerClient(Config(), on_compilers_refresh=refreshed.append)
+        mock_api.get(re.compile(r"https://godbolt\.org/api/compilers/c\+\+\?fields=.*"), payload=[], repeat=True)
+
+        try:
+            await client.get_compilers("c++")
+            assert refreshed == []
+
+            await client.get_compilers("c++", include_extended_info=True)
+            await client.get_compilers("c++", include_extended_info=True)  # cached, no refresh
+            assert refreshed == ["c++"]
+        finally:
+            await client.close()
+
     @pytest.mark.asyncio
     async def test_create_short_link(self, client, mock_api):
         """Test creating a short link."""
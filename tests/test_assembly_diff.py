@@ -1,11 +1,15 @@
 """Tests for assembly diff functionality."""
 
+import difflib
+
 from ce_mcp.assembly_diff import (
     extract_function_assembly,
     extract_function_call,
     extract_instruction,
+    format_unified_diff,
     generate_assembly_diff,
     generate_diff_summary,
+    match_lines,
     normalize_assembly,
 )
 
@@ -95,6 +99,56 @@ function1:
         assert "mov" in stats["unique_instructions_removed"]
         assert "pop" in stats["unique_instructions_removed"]
 
+    def test_generate_assembly_diff_from_lines(self):
+        """Test that pre-split assembly lines diff the same as the joined text."""
+        lines1 = ["main:", "    mov eax, 0", "    ret"]
+        lines2 = ["main:", "    xor eax, eax", "    ret"]
+
+        from_lines = generate_assembly_diff(lines1, lines2, "Version 1", "Version 2")
+        from_text = generate_assembly_diff("\n".join(lines1), "\n".join(lines2), "Version 1", "Version 2")
+
+        assert from_lines == from_text
+        assert from_lines["statistics"]["unique_instructions_added"] == ["xor"]
+
+    def test_format_unified_diff_matches_difflib(self):
+        """Test that the opcode-based unified diff renders exactly like difflib."""
+        lines1 = ["main:", "push rbp", "mov eax, 0", "pop rbp", "ret"] + [f"nop {i}" for i in range(10)] + ["ret"]
+        lines2 = ["main:", "push rbp", "xor eax, eax", "leave", "ret"] + [f"nop {i}" for i in range(10)] + ["jmp .L2"]
+
+        for context in (0, 1, 3):
+            opcodes = difflib.SequenceMatcher(None, lines1, lines2).get_opcodes()
+            expected = list(
+                difflib.unified_diff(lines1, lines2, fromfile="Version 1", tofile="Version 2", lineterm="", n=context)
+            )
+            assert format_unified_diff(lines1, lines2, opcodes, "Version 1", "Version 2", context) == expected
+
+    def test_match_lines_trims_common_prefix_and_suffix(self):
+        """Test that trimming shared prologue/epilogue lines still yields the full unified diff."""
+        prologue = [f"mov r{i}, {i}" for i in range(50)]
+        epilogue = [f"add r{i}, 1" for i in range(50)]
+        lines1 = prologue + ["mov eax, 0", "pop rbp"] + epilogue
+        lines2 = prologue + ["xor eax, eax", "leave", "nop"] + epilogue
+
+        opcodes = match_lines(lines1, lines2)
+        assert opcodes[0] == ("equal", 0, 50, 0, 50)
+        assert opcodes[-1] == ("equal", 52, 102, 53, 103)
+
+        expected = list(difflib.unified_diff(lines1, lines2, fromfile="a", tofile="b", lineterm=""))
+        assert format_unified_diff(lines1, lines2, opcodes, "a", "b") == expected
+        assert match_lines(lines1, lines1) == [("equal", 0, 102, 0, 102)]
+
+    def test_generate_assembly_diff_identical(self):
+        """Test that identical listings short-circuit to an empty diff."""
+        asm = "main:\n    xor eax, eax  # zero\n    ret"
+
+        for other in (asm, "main:\n    xor eax, eax\n    ret"):
+            diff_result = generate_assembly_diff(asm, other)
+            assert diff_result["unified_diff"] == ""
+            assert diff_result["side_by_side"] == []
+            assert diff_result["statistics"]["lines_added"] == 0
+            assert diff_result["statistics"]["unique_instructions_removed"] == []
+            assert diff_result["summary"] == "Assembly is identical"
+
     def test_diff_summary_generation(self):
         """Test diff summary generation."""
         stats = {
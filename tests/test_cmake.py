@@ -14,6 +14,8 @@ from ce_mcp.tools import (
     generate_cmake_share_url,
 )
 
+pytestmark = pytest.mark.usefixtures("reset_shared_clients")
+
 
 class TestCmakeBuild:
     """Test CMake build tool implementation."""
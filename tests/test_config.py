@@ -1,10 +1,5 @@
 """Tests for configuration management."""
 
-import tempfile
-from pathlib import Path
-
-import yaml
-
 from ce_mcp.config import APIConfig, Config, FiltersConfig
 
 
@@ -33,8 +28,10 @@ class TestConfig:
         assert config.filters.binary is False
         assert config.filters.intel is True
 
-    def test_load_from_file(self):
+    def test_load_from_file(self, tmp_path):
         """Test loading configuration from YAML file."""
+        import yaml
+
         config_data = {
             "compiler_explorer_mcp": {
                 "api": {
@@ -48,20 +45,16 @@ class TestConfig:
             }
         }
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", delete=False) as f:
-            yaml.dump(config_data, f)
-            temp_path = Path(f.name)
-
-        try:
-            config = Config.load_from_file(temp_path)
-            assert config.api.endpoint == "https://custom.api/"
-            assert config.api.timeout == 60
-            assert config.defaults.language == "rust"
-            assert config.defaults.compiler == "rustc"
-            # Check that other defaults are preserved
-            assert config.api.user_agent == "CompilerExplorerMCP/1.0"
-        finally:
-            temp_path.unlink()
+        temp_path = tmp_path / "config.yaml"
+        temp_path.write_text(yaml.safe_dump(config_data))
+
+        config = Config.load_from_file(temp_path)
+        assert config.api.endpoint == "https://custom.api/"
+        assert config.api.timeout == 60
+        assert config.defaults.language == "rust"
+        assert config.defaults.compiler == "rustc"
+        # Check that other defaults are preserved
+        assert config.api.user_agent == "CompilerExplorerMCP/1.0"
 
     def test_compiler_resolution(self):
         """Test compiler name resolution."""
@@ -1,27 +1,43 @@
 """Tests for MCP tools."""
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from ce_mcp.api_client import CompilerExplorerClient
 from ce_mcp.config import Config
+from ce_mcp.experimental_utils import ExperimentalCompiler, fetch_version_info_for_compilers
 from ce_mcp.tools import (
+    _analyze_execution_differences,
+    _collect_all_stderr,
+    _compiler_tools_cache,
+    _forget_language_tools,
+    _get_client,
+    _output_item_text,
     analyze_optimization,
     clear_tools_cache,
+    close_shared_clients,
     compare_compilers,
     compile_and_run,
     compile_check,
     compile_with_diagnostics,
     download_shortlink,
     extract_compiler_suggestion,
+    find_compilers,
     format_instruction_docs,
     generate_share_url,
+    get_languages_list,
+    get_libraries_list,
+    get_library_details_info,
     lookup_instruction,
     resolve_instruction_set,
     validate_tools_for_compiler,
 )
 
+pytestmark = pytest.mark.usefixtures("reset_shared_clients")
+
 
 class TestTools:
     """Test MCP tool implementations."""
@@ -50,10 +66,39 @@ class TestTools:
         # Test fix-it pattern
         assert extract_compiler_suggestion("note: fix-it applied: 'auto'") == "fix-it: 'auto'"
 
+        # "did you mean" takes priority even when another suggestion appears first
+        assert (
+            extract_compiler_suggestion("warning: use 'nullptr' instead; did you mean 'NULL'?")
+            == "did you mean 'NULL'?"
+        )
+
         # Test no suggestion
         assert extract_compiler_suggestion("error: syntax error") is None
         assert extract_compiler_suggestion("warning: unused variable") is None
 
+    def test_collect_all_stderr(self):
+        """Test stderr is gathered from every location of a compile response."""
+        result = {
+            "buildResult": {"stderr": [{"text": "error: expected ';'\n"}, {"text": ""}]},
+            "stderr": [{"text": "Build failed"}],
+            "buildsteps": [{"stderr": []}, {"stderr": [{"text": "ld: missing symbol\n"}]}],
+            "execResult": {"stderr": "killed\n"},
+        }
+
+        assert _collect_all_stderr(result) == (
+            "error: expected ';'\nBuild step 2: ld: missing symbol\nExecution: killed\n"
+        )
+
+        # The generic message is kept when there is nothing more detailed
+        assert _collect_all_stderr({"stderr": [{"text": "Build failed"}]}) == "Build failed"
+
+    def test_output_item_text(self):
+        """Test text extraction from dict and plain output entries."""
+        assert _output_item_text({"text": "hello"}) == "hello"
+        assert _output_item_text({"tag": {}}) == ""
+        assert _output_item_text("plain") == "plain"
+        assert _output_item_text(42) == "42"
+
     @pytest.fixture
     def mock_client(self):
         """Create mock API client."""
@@ -62,6 +107,27 @@ class TestTools:
             mock.return_value = client_instance
             yield client_instance
 
+    @pytest.mark.asyncio
+    async def test_shared_client_reused(self, config, mock_client):
+        """Test that tool calls with equal config settings share one client until it is closed."""
+        client = await _get_client(config)
+        assert await _get_client(config) is client
+        # A fresh Config with the same settings does not open another session
+        assert await _get_client(Config()) is client
+
+        # Different settings get their own client and leave this one open
+        other_config = Config()
+        other_config.filters.intel = False
+        other_client = AsyncMock()
+        with patch("ce_mcp.tools.CompilerExplorerClient", return_value=other_client):
+            assert await _get_client(other_config) is other_client
+        mock_client.close.assert_not_awaited()
+        assert await _get_client(config) is client
+
+        await close_shared_clients()
+        mock_client.close.assert_awaited_once()
+        other_client.close.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_compile_check_success(self, config, mock_client):
         """Test successful compilation check."""
@@ -147,6 +213,33 @@ class TestTools:
         assert result["execution_time_ms"] == 42
         assert result["truncated"] is False
 
+    @pytest.mark.asyncio
+    async def test_compile_and_run_list_output(self, config, mock_client):
+        """Test list-form stdout/stderr are joined for both successful and failed builds."""
+        mock_client.compile_and_execute.return_value = {
+            "buildResult": {"code": 0},
+            "didExecute": True,
+            "code": 0,
+            "stdout": [{"text": "Hello\n"}, {"text": "World\n"}],
+            "stderr": [{"text": "note\n"}],
+        }
+        args = {"source": "int main() {}", "language": "c++", "compiler": "g++"}
+
+        result = await compile_and_run(args, config)
+        assert result["stdout"] == "Hello\nWorld\n"
+        assert result["stderr"] == "note\n"
+
+        mock_client.compile_and_execute.return_value = {
+            "buildResult": {"code": 1, "stdout": [{"text": "make: *** "}], "stderr": [{"text": "error: oops\n"}]},
+            "code": -1,
+            "stderr": [{"text": "Build failed"}],
+        }
+
+        result = await compile_and_run(args, config)
+        assert result["compiled"] is False
+        assert result["stdout"] == "make: *** "
+        assert result["stderr"] == "error: oops\n"
+
     @pytest.mark.asyncio
     async def test_compile_with_diagnostics(self, config, mock_client):
         """Test compilation with diagnostics."""
@@ -179,6 +272,57 @@ class TestTools:
         assert result["diagnostics"][1]["type"] == "warning"
         assert "clang1700" in result["command"]
 
+    @pytest.mark.asyncio
+    async def test_compile_with_diagnostics_files(self, config, mock_client):
+        """Test that extra files are forwarded in a single compile request."""
+        mock_client.compile.return_value = {"code": 0, "stderr": []}
+        files = [{"filename": "util.h", "contents": "int util();"}]
+
+        await compile_with_diagnostics(
+            {"source": '#include "util.h"', "language": "c++", "compiler": "g132", "files": files},
+            config,
+        )
+
+        mock_client.compile.assert_called_once()
+        assert mock_client.compile.call_args.kwargs["files"] == files
+
+    @pytest.mark.asyncio
+    async def test_compile_with_diagnostics_keeps_assembly_for_tools(self, config, mock_client):
+        """Test that assembly is only skipped when no post-compilation tools run."""
+        mock_client.compile.return_value = {"code": 0, "stderr": []}
+        mock_client.get_compilers.return_value = [
+            {"id": "clang1500", "name": "x86-64 clang 15.0.0", "tools": {"llvm-mcatrunk": {"id": "llvm-mcatrunk"}}}
+        ]
+        arguments = {"source": "int main() { return 0; }", "language": "c++", "compiler": "clang1500"}
+
+        await compile_with_diagnostics(arguments, config)
+        assert mock_client.compile.call_args.kwargs["get_assembly"] is False
+
+        clear_tools_cache()
+        await compile_with_diagnostics({**arguments, "tools": [{"id": "llvm-mcatrunk", "args": []}]}, config)
+        assert mock_client.compile.call_args.kwargs["get_assembly"] is True
+        assert mock_client.compile.call_args.kwargs["tools"] == [{"id": "llvm-mcatrunk", "args": []}]
+
+        clear_tools_cache()
+
+    @pytest.mark.asyncio
+    async def test_compile_with_diagnostics_untagged_classification(self, config, mock_client):
+        """Test untagged diagnostics are only errors when they mention the word 'error'."""
+        mock_client.compile.return_value = {
+            "code": 0,
+            "stderr": [
+                {"text": "warning: unused variable 'terror'", "line": 2, "column": 9},
+                {"text": "fatal error: foo.h: No such file", "line": 1, "column": 10},
+            ],
+        }
+
+        result = await compile_with_diagnostics(
+            {"source": "int main() { return 0; }", "language": "c++", "compiler": "g++"},
+            config,
+        )
+
+        assert [d["type"] for d in result["diagnostics"]] == ["warning", "error"]
+
     @pytest.mark.asyncio
     async def test_compile_with_diagnostics_suggestions(self, config, mock_client):
         """Test diagnostics with suggestion extraction."""
@@ -260,6 +404,23 @@ class TestTools:
         assert "total_instructions" in result
         assert result["assembly_lines"] == 4
 
+    @pytest.mark.asyncio
+    async def test_analyze_optimization_truncation(self, config, mock_client):
+        """Test that assembly output stops at the configured line limit."""
+        config.output_limits.max_assembly_lines = 2
+        mock_client.compile.return_value = {"code": 0, "asm": "main:\n\n\tmov\teax, 0\n\tnop\n\tret"}
+
+        result = await analyze_optimization(
+            {"source": "int main() { return 0; }", "language": "c++", "compiler": "g++", "optimization_level": "-O2"},
+            config,
+        )
+
+        assert result["assembly_output"] == ["main:", "mov\teax, 0"]
+        assert result["instruction_count"] == 2
+        assert result["truncated"] is True
+        assert result["assembly_lines"] == 5
+        assert result["total_instructions"] == 5
+
     @pytest.mark.asyncio
     async def test_compare_compilers(self, config, mock_client):
         """Test compiler comparison."""
@@ -292,6 +453,73 @@ class TestTools:
         assert result["results"][1]["assembly_size"] == 1
         assert len(result["differences"]) > 0
 
+    @pytest.mark.asyncio
+    async def test_compare_compilers_duplicate_configs(self, config, mock_client):
+        """Test that repeated compiler/options pairs are compiled once."""
+        mock_client.compile.return_value = {"code": 0, "stderr": [{"text": "warning: unused"}]}
+
+        result = await compare_compilers(
+            {
+                "source": "int main() { return 0; }",
+                "language": "c++",
+                "compilers": [
+                    {"id": "g++", "options": "-O2"},
+                    {"id": "g132", "options": "-O2"},
+                ],
+                "comparison_type": "diagnostics",
+            },
+            config,
+        )
+
+        assert mock_client.compile.call_count == 1
+        assert [r["warnings"] for r in result["results"]] == [1, 1]
+        assert result["differences"] == []
+
+    @pytest.mark.asyncio
+    async def test_compare_compilers_cached(self, config, mock_client):
+        """Test that repeating a compile-only comparison is served from the cache."""
+        mock_client.compile.return_value = {"code": 0, "stderr": [{"text": "warning: unused"}]}
+        arguments = {
+            "source": "int main() { return 0; }",
+            "language": "c++",
+            "compilers": [{"id": "g132", "options": "-O2"}, {"id": "clang1600", "options": "-O2"}],
+            "comparison_type": "diagnostics",
+        }
+
+        first = await compare_compilers(arguments, config)
+        second = await compare_compilers(arguments, config)
+
+        assert mock_client.compile.call_count == 2
+        assert second == first
+
+        # Closing the shared clients drops the cached results
+        await close_shared_clients()
+        await compare_compilers(arguments, config)
+        assert mock_client.compile.call_count == 4
+
+        # Different output filters give different assembly, so they are not served another Config's result
+        other_config = Config()
+        other_config.filters.intel = False
+        await compare_compilers(arguments, other_config)
+        assert mock_client.compile.call_count == 6
+
+    @pytest.mark.asyncio
+    async def test_compare_compilers_skips_uncacheable_results(self, config, mock_client):
+        """Test that results CE marks as not cacheable, or that timed out, are compiled again."""
+        arguments = {
+            "source": "int main() { return 0; }",
+            "language": "c++",
+            "compilers": [{"id": "g132", "options": "-O2"}],
+            "comparison_type": "diagnostics",
+        }
+
+        for response in ({"code": -1, "okToCache": False, "stderr": []}, {"code": -1, "timedOut": True, "stderr": []}):
+            mock_client.compile.reset_mock()
+            mock_client.compile.return_value = response
+            await compare_compilers(arguments, config)
+            await compare_compilers(arguments, config)
+            assert mock_client.compile.call_count == 2
+
     @pytest.mark.asyncio
     async def test_compare_compilers_execution(self, config, mock_client):
         """Test compiler comparison for execution results."""
@@ -350,6 +578,21 @@ class TestTools:
         assert "stderr_diff" in result["execution_diff"]
         assert "summary" in result["execution_diff"]
 
+    def test_execution_diff_skips_oversized_output(self):
+        """Test that very large outputs are summarised instead of diffed line by line."""
+        big = "x\n" * 400_000
+        base = {"options": "-O2", "compiled": True, "executed": True, "exit_code": 0, "stderr": ""}
+        results = [
+            {**base, "compiler": "g132", "stdout": big},
+            {**base, "compiler": "clang1600", "stdout": big + "y\n" * 300_000},
+        ]
+
+        differences, details = _analyze_execution_differences(results)
+
+        assert "Stdout differs: clang1600 output has 300000 more lines" in differences
+        assert details["stdout_diff"].startswith("(diff omitted")
+        assert details["summary"] == "Execution comparison: stdout differs"
+
     @pytest.mark.asyncio
     async def test_generate_share_url(self, config, mock_client):
         """Test share URL generation."""
@@ -396,38 +639,62 @@ int main() { return 0; }"""
         assert "-std=c++17 -O2" in options_arg
 
     @pytest.mark.asyncio
-    async def test_find_compilers_with_tools_parameters(self, config, mock_client):
-        """Test find compilers parameters are passed correctly."""
-        from unittest.mock import patch
+    async def test_fetch_version_info_once_per_compiler(self):
+        """Test that a nightly compiler listed in several categories is fetched once."""
+        nightly = ExperimentalCompiler(
+            id="clang_trunk",
+            name="Clang trunk",
+            category="trunk_nightly",
+            proposal_numbers=[],
+            features=[],
+            is_nightly=True,
+            description="Clang trunk",
+        )
+        release = ExperimentalCompiler(
+            id="g132",
+            name="GCC 13.2",
+            category="other_experimental",
+            proposal_numbers=[],
+            features=[],
+            is_nightly=False,
+            description="GCC 13.2",
+        )
+        client = AsyncMock()
+        client.get_compiler_version.return_value = {"version": "clang version 21.0.0git", "modified": "2025-07-24"}
 
-        from ce_mcp.tools import find_compilers
+        await fetch_version_info_for_compilers([nightly, release, nightly], client)
 
-        # Mock the search function to return a simple result
-        with patch("ce_mcp.tools.search_experimental_compilers") as mock_search:
-            # Mock compiler with tools
-            from ce_mcp.experimental_utils import ExperimentalCompiler
-
-            test_compiler = ExperimentalCompiler(
-                id="test_gcc",
-                name="Test GCC",
-                proposal_numbers=[],
-                features=[],
-                is_nightly=False,
-                description="Test GCC compiler",
-                version_info=None,
-                modified=None,
-                category="standard",
-            )
+        client.get_compiler_version.assert_awaited_once_with("clang_trunk")
+        assert nightly.modified == "2025-07-24"
+        assert release.version_info is None
 
-            # Add tool attributes
-            test_compiler.possible_runtime_tools = [
+    @pytest.fixture
+    def experimental_compiler(self):
+        """Create a test compiler with tool attributes."""
+        return ExperimentalCompiler(
+            id="test_gcc",
+            name="Test GCC",
+            proposal_numbers=[],
+            features=[],
+            is_nightly=False,
+            description="Test GCC compiler",
+            version_info=None,
+            modified=None,
+            category="standard",
+            possible_runtime_tools=[
                 {"id": "perf", "name": "perf profiler"},
                 {"id": "valgrind", "name": "Valgrind"},
-            ]
-            test_compiler.tools = [{"id": "analyzer", "name": "Static Analyzer"}]
-            test_compiler.possible_overrides = [{"name": "arch", "values": ["x86_64"]}]
+            ],
+            tools=[{"id": "analyzer", "name": "Static Analyzer"}],
+            possible_overrides=[{"name": "arch", "values": ["x86_64"]}],
+        )
 
-            mock_search.return_value = [test_compiler]
+    @pytest.mark.asyncio
+    async def test_find_compilers_with_tools_parameters(self, config, mock_client, experimental_compiler):
+        """Test find compilers parameters are passed correctly."""
+        # Mock the search function to return a simple result
+        with patch("ce_mcp.tools.search_experimental_compilers") as mock_search:
+            mock_search.return_value = [experimental_compiler]
 
             # Test with tool options enabled
             result = await find_compilers(
@@ -448,34 +715,11 @@ int main() { return 0; }"""
             # Verify the mock was called with correct parameters
             mock_search.assert_called_once()
 
-    def test_find_compilers_format_function(self):
+    def test_find_compilers_format_function(self, experimental_compiler):
         """Test the format_compiler_info function with tool options."""
-        from ce_mcp.experimental_utils import ExperimentalCompiler
-
-        # Create a test compiler
-        compiler = ExperimentalCompiler(
-            id="test_gcc",
-            name="Test GCC",
-            proposal_numbers=[],
-            features=[],
-            is_nightly=False,
-            description="Test GCC compiler",
-            version_info=None,
-            modified=None,
-            category="standard",
-        )
-
-        # Add tool attributes
-        compiler.possible_runtime_tools = [
-            {"id": "perf", "name": "perf profiler"},
-            {"id": "valgrind", "name": "Valgrind"},
-        ]
-        compiler.tools = [{"id": "analyzer", "name": "Static Analyzer"}]
-        compiler.possible_overrides = [{"name": "arch", "values": ["x86_64"]}]
+        compiler = experimental_compiler
 
         # Test basic formatting (no tools)
-        from ce_mcp.tools import find_compilers
-
         # Get the format function from the find_compilers function scope
         # This is a bit tricky since it's a nested function, so we'll test it indirectly
         # Test ids_only mode
@@ -530,8 +774,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_get_libraries_list(self, config, mock_client):
         """Test get libraries list functionality."""
-        from ce_mcp.tools import get_libraries_list
-
         # Mock API response
         mock_client.get_libraries_list.return_value = [
             {"id": "boost", "name": "Boost C++ Libraries"},
@@ -567,8 +809,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_get_library_details_info(self, config, mock_client):
         """Test get library details functionality."""
-        from ce_mcp.tools import get_library_details_info
-
         # Mock API response
         mock_library = {
             "id": "boost",
@@ -620,8 +860,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_get_languages_list(self, config, mock_client):
         """Test get languages list functionality."""
-        from ce_mcp.tools import get_languages_list
-
         # Mock API response
         mock_client.get_languages_list.return_value = [
             {"id": "c++", "name": "C++", "extensions": [".cpp", ".cxx", ".h"]},
@@ -660,8 +898,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_api_client_libraries_methods(self, config):
         """Test API client library methods."""
-        from ce_mcp.api_client import CompilerExplorerClient
-
         client = CompilerExplorerClient(config)
 
         # Mock the base get_libraries method
@@ -727,8 +963,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_validate_tools_for_compiler_valid_tools(self, config):
         """Test tool validation with valid tools."""
-        from ce_mcp.api_client import CompilerExplorerClient
-
         mock_client = AsyncMock(spec=CompilerExplorerClient)
 
         # Mock compiler with tools
@@ -761,8 +995,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_validate_tools_for_compiler_invalid_tools(self, config):
         """Test tool validation with invalid tools."""
-        from ce_mcp.api_client import CompilerExplorerClient
-
         mock_client = AsyncMock(spec=CompilerExplorerClient)
 
         # Mock compiler with tools
@@ -801,8 +1033,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_validate_tools_for_compiler_missing_tools_field(self, config):
         """Test tool validation when compiler doesn't have tools field."""
-        from ce_mcp.api_client import CompilerExplorerClient
-
         mock_client = AsyncMock(spec=CompilerExplorerClient)
 
         # Mock compiler without tools field
@@ -827,8 +1057,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_validate_tools_for_compiler_missing_id(self, config):
         """Test tool validation with tool missing id field."""
-        from ce_mcp.api_client import CompilerExplorerClient
-
         mock_client = AsyncMock(spec=CompilerExplorerClient)
 
         # Mock compiler with tools
@@ -857,8 +1085,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_compile_with_diagnostics_tool_warnings(self, config):
         """Test that compile_with_diagnostics includes tool warnings in response."""
-        from unittest.mock import patch
-
         mock_client = AsyncMock()
         mock_client.compile.return_value = {
             "code": 0,
@@ -891,8 +1117,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_compile_and_run_tool_warnings(self, config):
         """Test that compile_and_run includes tool warnings in response."""
-        from unittest.mock import patch
-
         mock_client = AsyncMock()
         mock_client.compile_and_execute.return_value = {
             "code": 0,
@@ -927,10 +1151,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_validate_tools_cache_functionality(self, config):
         """Test that tool validation uses caching to avoid repeated API calls."""
-        from unittest.mock import patch
-
-        from ce_mcp.api_client import CompilerExplorerClient
-
         # Clear cache before test
         clear_tools_cache()
 
@@ -972,10 +1192,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_validate_tools_cache_expiration(self, config):
         """Test that cache expires after TTL."""
-        from unittest.mock import patch
-
-        from ce_mcp.api_client import CompilerExplorerClient
-
         # Clear cache before test
         clear_tools_cache()
 
@@ -996,7 +1212,7 @@ int main() { return 0; }"""
         tools = [{"id": "Sonar", "args": []}]
 
         # Mock time to control cache expiration
-        with patch("ce_mcp.tools.time.time") as mock_time:
+        with patch("ce_mcp.tools.time.monotonic") as mock_time:
             # First call at time 0
             mock_time.return_value = 0
             await validate_tools_for_compiler(tools, "clang1500", "c++", mock_client)
@@ -1018,8 +1234,6 @@ int main() { return 0; }"""
     @pytest.mark.asyncio
     async def test_validate_tools_cache_different_compilers(self, config):
         """Test that cache works correctly for different compilers."""
-        from ce_mcp.api_client import CompilerExplorerClient
-
         # Clear cache before test
         clear_tools_cache()
 
@@ -1070,6 +1284,76 @@ int main() { return 0; }"""
         # Clear cache for cleanup
         clear_tools_cache()
 
+    @pytest.mark.asyncio
+    async def test_validate_tools_cache_invalidation_on_refresh(self, config):
+        """Test that refetching a language's compiler list drops its cached tools."""
+        clear_tools_cache()
+
+        mock_client = AsyncMock(spec=CompilerExplorerClient)
+        mock_client.get_compilers.return_value = [
+            {"id": "clang1500", "name": "x86-64 clang 15.0.0", "tools": {"Sonar": {"id": "Sonar", "name": "Sonar"}}}
+        ]
+
+        tools = [{"id": "Sonar", "args": []}]
+        await validate_tools_for_compiler(tools, "clang1500", "c++", mock_client)
+        await validate_tools_for_compiler(tools, "clang1500", "c", mock_client)
+
+        # A refresh of the C++ list leaves the C entry cached
+        _forget_language_tools("c++")
+        await validate_tools_for_compiler(tools, "clang1500", "c", mock_client)
+        assert mock_client.get_compilers.call_count == 2
+
+        await validate_tools_for_compiler(tools, "clang1500", "c++", mock_client)
+        assert mock_client.get_compilers.call_count == 3
+
+        clear_tools_cache()
+
+    @pytest.mark.asyncio
+    async def test_validate_tools_cache_eviction(self, config):
+        """Test that the tools cache evicts its oldest entry once full."""
+        clear_tools_cache()
+
+        mock_client = AsyncMock(spec=CompilerExplorerClient)
+        mock_client.get_compilers.return_value = [
+            {"id": compiler_id, "name": compiler_id, "tools": {"Sonar": {"id": "Sonar", "name": "Sonar"}}}
+            for compiler_id in ("clang1500", "g132", "g141")
+        ]
+
+        tools = [{"id": "Sonar", "args": []}]
+        with patch("ce_mcp.tools._COMPILER_TOOLS_CACHE_MAX_ENTRIES", 2):
+            for compiler_id in ("clang1500", "g132", "g141"):
+                await validate_tools_for_compiler(tools, compiler_id, "c++", mock_client)
+
+        assert list(_compiler_tools_cache) == ["c++:g132", "c++:g141"]
+
+        clear_tools_cache()
+
+    @pytest.mark.asyncio
+    async def test_validate_tools_cache_dedup_concurrent(self, config):
+        """Test that concurrent cache misses share a single API call."""
+        clear_tools_cache()
+
+        mock_client = AsyncMock(spec=CompilerExplorerClient)
+
+        async def slow_get_compilers(language, include_extended_info=False):
+            # Yield to the event loop so the other validations miss the cache while this fetch is in flight
+            await asyncio.sleep(0)
+            return [
+                {"id": "clang1500", "name": "x86-64 clang 15.0.0", "tools": {"Sonar": {"id": "Sonar", "name": "Sonar"}}}
+            ]
+
+        mock_client.get_compilers.side_effect = slow_get_compilers
+
+        tools = [{"id": "Sonar", "args": []}]
+        results = await asyncio.gather(
+            *(validate_tools_for_compiler(tools, "clang1500", "c++", mock_client) for _ in range(10))
+        )
+
+        assert mock_client.get_compilers.call_count == 1
+        assert all(valid_tools == tools and not warnings for valid_tools, warnings in results)
+
+        clear_tools_cache()
+
     @pytest.mark.asyncio
     async def test_download_shortlink_basic(self, config, tmp_path):
         """Test basic shortlink download functionality."""
@@ -1,6 +1,6 @@
 """Tests for utility functions."""
 
-from ce_mcp.utils import extract_compile_args_from_source, truncate_output
+from ce_mcp.utils import extract_compile_args_from_source, resolve_filename_conflicts, truncate_output
 
 
 class TestExtractCompileArgs:
@@ -58,3 +58,22 @@ class TestTruncateOutput:
         assert len(result.splitlines()[0]) == 203  # 200 chars + "..."
         assert was_truncated
         assert result.startswith("A" * 200)
+
+    def test_line_boundaries_match_splitlines(self):
+        # A trailing newline is not an extra line, but an empty line before it is
+        assert truncate_output("a\nb\n", 2, 100) == ("a\nb", False)
+        assert truncate_output("a\n\nb", 2, 100) == ("a\n\n... (output truncated)", True)
+        # \r\n and lone \r also end lines
+        assert truncate_output("a\r\nb\rc", 2, 100) == ("a\nb\n... (output truncated)", True)
+
+
+class TestResolveFilenameConflicts:
+    """Test filename conflict resolution."""
+
+    def test_no_conflict(self, tmp_path):
+        assert resolve_filename_conflicts(tmp_path, "main.cpp") == "main.cpp"
+
+    def test_numbered_variants(self, tmp_path):
+        for name in ("main.cpp", "main_1.cpp", "main_2.cpp"):
+            (tmp_path / name).write_text("")
+        assert resolve_filename_conflicts(tmp_path, "main.cpp") == "main_3.cpp"